@@ -0,0 +1,164 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from neo_lms.utils import buffers
+
+from .models import Activity
+
+# Buffered intervals still in the cache; a flush scans this many back, so the
+# worker may fall that far behind before events are dropped.
+BUFFERED_INTERVALS = 10
+
+FLUSH_LOCK_KEY = 'activity:flush-lock'
+PURGE_KEY = 'activity:purged'
+
+
+def _interval(timestamp):
+    return int(timestamp // settings.ACTIVITY_FLUSH_INTERVAL)
+
+
+def _counter_key(interval):
+    return f'activity:{interval}:n'
+
+
+def _entry_key(interval, n):
+    return f'activity:{interval}:entry:{n}'
+
+
+def _at_key(interval, user_id, kind):
+    return f'activity:{interval}:at:{user_id}:{kind}'
+
+
+def record(user_id, kind, at=None):
+    """
+    Note that ``user_id`` did ``kind`` (an ``Activity.Kinds`` value) just now.
+
+    No database write: the event lands in the shared cache (ACTIVITY_BUFFER)
+    or in this process's ``local_buffer``, and the next flush writes
+    one row per user and kind for the interval, keeping the latest time.
+    """
+    at = at or timezone.now()
+    if not settings.ACTIVITY_BUFFER:
+        get_local_buffer().add((user_id, kind), at)
+        return
+    interval = _interval(at.timestamp())
+    timeout = settings.ACTIVITY_FLUSH_INTERVAL * (BUFFERED_INTERVALS + 1)
+    key = _at_key(interval, user_id, kind)
+    if cache.add(key, at, timeout):
+        # First event of this user and kind in the interval: index it.
+        cache.add(_counter_key(interval), 0, timeout)
+        n = cache.incr(_counter_key(interval))
+        cache.set(_entry_key(interval, n), (user_id, kind), timeout)
+    else:
+        cache.set(key, at, timeout)
+
+
+def collect(now=None):
+    """
+    Buffered events of the finished intervals as (user_id, kind, at), plus
+    the cache keys to drop once they are written.
+    """
+    current = _interval(now if now is not None else time.time())
+    events = []
+    keys = []
+    for interval in range(current - BUFFERED_INTERVALS, current):
+        count = cache.get(_counter_key(interval))
+        if not count:
+            continue
+        entries = cache.get_many([_entry_key(interval, n) for n in range(1, count + 1)])
+        at_keys = [_at_key(interval, user_id, kind) for user_id, kind in entries.values()]
+        times = cache.get_many(at_keys)
+        for (user_id, kind), key in zip(entries.values(), at_keys):
+            if key in times:
+                events.append((user_id, kind, times[key]))
+        keys += [_counter_key(interval), *entries, *at_keys]
+    return events, keys
+
+
+def write(events):
+    """
+    Store events in bulk: one INSERT for the feed rows, one UPDATE for the
+    ``last_login`` values that move forward. Returns the rows written.
+    """
+    if not events:
+        return 0
+    User = get_user_model()
+    # Token claims may carry the id as a string.
+    events = [(User._meta.pk.to_python(user_id), kind, at) for user_id, kind, at in events]
+    logins = {}
+    for user_id, kind, at in events:
+        if kind == Activity.Kinds.LOGIN and (user_id not in logins or at > logins[user_id]):
+            logins[user_id] = at
+    user_ids = {user_id for user_id, _, _ in events}
+    users = User.objects.filter(pk__in=user_ids).only('pk', 'last_login')
+    existing = set()
+    advanced = []
+    for user in users:
+        existing.add(user.pk)
+        at = logins.get(user.pk)
+        # Jobs and flushes may run out of order; never move last_login backwards.
+        if at and (user.last_login is None or user.last_login < at):
+            user.last_login = at
+            advanced.append(user)
+    if advanced:
+        User.objects.bulk_update(advanced, ['last_login'])
+    rows = Activity.objects.bulk_create(
+        Activity(user_id=user_id, kind=kind, at=at)
+        for user_id, kind, at in events
+        if user_id in existing
+    )
+    return len(rows)
+
+
+def _latest(previous, at):
+    return at if previous is None or at > previous else previous
+
+
+def _write_pending(pending):
+    return write([(user_id, kind, at) for (user_id, kind), at in pending.items()])
+
+
+def local_buffer(interval):
+    """
+    Per-process stand-in for the cache buffer when no cache is shared with
+    the workers: latest time per (user, kind), written every ``interval``
+    seconds once started.
+    """
+    return buffers.CoalescingBuffer('activity-flush', _write_pending, _latest, interval)
+
+
+_local_buffer = None
+_local_buffer_lock = threading.Lock()
+
+
+def get_local_buffer():
+    global _local_buffer
+    if _local_buffer is None:
+        with _local_buffer_lock:
+            if _local_buffer is None:
+                _local_buffer = buffers.register(local_buffer(settings.ACTIVITY_FLUSH_INTERVAL))
+    return _local_buffer
+
+
+def flush(now=None):
+    """
+    Write the buffered events of the finished intervals; one flush at a time.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, 1, settings.ACTIVITY_FLUSH_INTERVAL):
+        return 0
+    try:
+        events, keys = collect(now)
+        written = write(events)
+        cache.delete_many(keys)
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+    if cache.add(PURGE_KEY, 1, 24 * 60 * 60):
+        cutoff = timezone.now() - timedelta(days=settings.ACTIVITY_RETENTION_DAYS)
+        Activity.objects.filter(at__lt=cutoff).delete()
+    return written
@@ -0,0 +1,113 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+
+from neo_lms.db_router import replica_reads
+from neo_lms.utils.async_views import AsyncAPIView, error_payload, json_response
+from neo_lms.utils.throttling import LoginRateThrottle
+
+from .authentication import aresolve_user
+from .hashing import HashingPoolBusy, get_hashing_pool
+from .serializers import PersianTokenObtainPairSerializer, UserRegistrationSerializer, UserSerializer
+from .views import _attach_tokens
+
+
+def _run_serializer(serializer_class, data, on_valid):
+    """
+    Validate (and act on) a serializer inside a pool thread.
+
+    Returns ``(status_code, payload)`` so that nothing touching the ORM or the
+    password hasher runs on the event loop.
+    """
+    serializer = serializer_class(data=data)
+    try:
+        serializer.is_valid(raise_exception=True)
+    except APIException as exc:
+        return exc.status_code, error_payload(exc.detail)
+    return on_valid(serializer)
+
+
+def _obtain_pair(data):
+    return _run_serializer(
+        PersianTokenObtainPairSerializer,
+        data,
+        lambda s: (
+            status.HTTP_200_OK,
+            {'access': str(s.validated_data['access']), 'refresh': str(s.validated_data['refresh'])},
+        ),
+    )
+
+
+def _register(data):
+    def create(serializer):
+        serializer.save()
+        return status.HTTP_201_CREATED, serializer.data
+
+    return _run_serializer(UserRegistrationSerializer, data, create)
+
+
+class AsyncHashingView(AsyncAPIView):
+    """
+    Async endpoint whose CPU-bound work runs in the bounded hashing pool.
+    """
+
+    http_method_names = ['post', 'options']
+
+    async def dispatch_job(self, request, job):
+        # Like SimpleJWT's token views, throttle as an unauthenticated caller.
+        response = await self.check_throttles(request)
+        if response is not None:
+            return None, response
+
+        try:
+            data = self.parse_body(request)
+        except ValueError:
+            return None, json_response({'detail': 'بدنه درخواست JSON معتبر نیست.'}, status.HTTP_400_BAD_REQUEST)
+
+        try:
+            return await get_hashing_pool().run(job, data), None
+        except HashingPoolBusy:
+            response = json_response({'detail': 'سرور مشغول است، لطفاً دوباره تلاش کنید.'}, status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = '1'
+            return None, response
+
+
+class AsyncCookieTokenObtainPairView(AsyncHashingView):
+    throttle_classes = (LoginRateThrottle,)
+
+    async def post(self, request, *args, **kwargs):
+        result, response = await self.dispatch_job(request, _obtain_pair)
+        if response is not None:
+            return response
+
+        status_code, payload = result
+        if status_code != status.HTTP_200_OK:
+            return json_response(payload, status_code)
+
+        response = json_response({'detail': 'ورود با موفقیت انجام شد.'}, status.HTTP_200_OK)
+        _attach_tokens(response, payload['access'], payload['refresh'])
+        return response
+
+
+class AsyncRegisterView(AsyncHashingView):
+    async def post(self, request, *args, **kwargs):
+        result, response = await self.dispatch_job(request, _register)
+        if response is not None:
+            return response
+        status_code, payload = result
+        return json_response(payload, status_code)
+
+
+class AsyncUserMeView(AsyncAPIView):
+    async def get(self, request, *args, **kwargs):
+        try:
+            user = await self.authenticate(request)
+        except AuthenticationFailed as exc:
+            return json_response(error_payload(exc.detail), exc.status_code)
+        if not user.is_authenticated:
+            return json_response({'detail': NotAuthenticated.default_detail}, status.HTTP_401_UNAUTHORIZED)
+
+        throttled = await self.check_throttles(request, user)
+        if throttled is not None:
+            return throttled
+        with replica_reads():
+            return json_response(UserSerializer(await aresolve_user(user)).data)
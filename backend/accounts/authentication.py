@@ -1,10 +1,134 @@
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+User = get_user_model()
+
+USER_CACHE_KEY = 'accounts:user:{pk}'
+# Columns kept in the cache: the claims plus what the profile endpoints show.
+# Never the password hash; other fields load on access.
+CACHED_USER_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'role', 'is_active', 'is_staff', 'is_superuser',
+)
+
+
+def _user_from_values(values):
+    # from_db takes the loaded values in model field order.
+    loaded = dict(zip(CACHED_USER_FIELDS, values))
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in loaded]
+    return User.from_db(User.objects.db, names, [loaded[name] for name in names])
+
+
+def get_cached_user(pk):
+    """
+    Load a user by primary key through a short-lived cache entry.
+    """
+    key = USER_CACHE_KEY.format(pk=pk)
+    values = cache.get(key)
+    if values is None:
+        values = User.objects.values_list(*CACHED_USER_FIELDS).get(pk=pk)
+        cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+    return _user_from_values(values)
+
+
+async def aget_cached_user(pk):
+    key = USER_CACHE_KEY.format(pk=pk)
+    values = await cache.aget(key)
+    if values is None:
+        values = await User.objects.values_list(*CACHED_USER_FIELDS).aget(pk=pk)
+        await cache.aset(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+    return _user_from_values(values)
+
+
+def forget_cached_user(pk):
+    cache.delete(USER_CACHE_KEY.format(pk=pk))
+
+
+def resolve_user(user):
+    """
+    Return a real User instance for ``request.user``, whatever the auth mode.
+    """
+    if isinstance(user, TokenBackedUser):
+        return user.instance
+    return user
+
+
+async def aresolve_user(user):
+    if isinstance(user, TokenBackedUser):
+        return await aget_cached_user(user.pk)
+    return user
+
+
+class TokenBackedUser(TokenUser):
+    """
+    Request user built from access-token claims (id, role, is_active).
+
+    Role checks need no database access. Any other attribute falls back to
+    the full model via ``get_cached_user``.
+    """
+
+    Roles = User.Roles
+
+    @cached_property
+    def id(self):
+        # The claim holds str(user_id); compare like a model instance's pk.
+        return User._meta.pk.to_python(self.token[jwt_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def role(self):
+        return self.token.get('role')
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+    @property
+    def is_student(self) -> bool:
+        return self.role == self.Roles.STUDENT
+
+    @property
+    def is_instructor(self) -> bool:
+        return self.role == self.Roles.INSTRUCTOR
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == self.Roles.ADMIN
+
+    @cached_property
+    def instance(self):
+        return get_cached_user(self.pk)
+
+    @cached_property
+    def username(self):
+        return self.instance.username
+
+    def __str__(self) -> str:
+        return str(self.instance)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_') or attr == 'token':
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.instance, attr)
 
 
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Extends SimpleJWT auth to also look for access tokens in HttpOnly cookies.
+
+    With ``AUTH_TOKEN_USER`` enabled, tokens carrying a ``role`` claim are
+    resolved to a ``TokenBackedUser`` instead of a user-table lookup.
     """
 
     def authenticate(self, request):
@@ -18,3 +142,43 @@ class CookieJWTAuthentication(JWTAuthentication):
             return self.get_user(validated_token), validated_token
 
         return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if settings.AUTH_TOKEN_USER and 'role' in validated_token:
+            user = TokenBackedUser(validated_token)
+            if not user.is_active:
+                raise AuthenticationFailed('حساب کاربری غیرفعال است.', code='user_inactive')
+            return user
+        return super().get_user(validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of ``authenticate`` for plain Django async views.
+
+        Token validation is CPU-only; the user is either built from claims or
+        loaded with the async ORM.
+        """
+        header = self.get_header(request)
+        raw_token = (
+            request.COOKIES.get(settings.AUTH_COOKIE_ACCESS)
+            if header is None
+            else self.get_raw_token(header)
+        )
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if settings.AUTH_TOKEN_USER and 'role' in validated_token:
+            return self.get_user(validated_token), validated_token
+
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise AuthenticationFailed('توکن شامل شناسه کاربر نیست.', code='token_not_valid')
+        try:
+            user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed('کاربر یافت نشد.', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('حساب کاربری غیرفعال است.', code='user_inactive')
+        return user, validated_token
@@ -1,6 +1,5 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
-from django.db.models import Q
 
 
 class EmailOrUsernameModelBackend(ModelBackend):
@@ -8,6 +7,20 @@ class EmailOrUsernameModelBackend(ModelBackend):
     Authenticate against either username or email (case-insensitive).
     """
 
+    def get_login_user(self, identifier: str):
+        """
+        Resolve the login identifier with index-only lookups.
+
+        Inputs containing '@' are tried against LOWER(email) first; usernames
+        may legally contain '@', so an exact username match is the fallback.
+        """
+        user_model = get_user_model()
+        if '@' in identifier:
+            user = user_model.objects.filter_by_email(identifier).first()
+            if user is not None:
+                return user
+        return user_model.objects.get(username=identifier)
+
     def authenticate(self, request, username=None, password=None, **kwargs):
         user_model = get_user_model()
         if username is None:
@@ -16,9 +29,7 @@ class EmailOrUsernameModelBackend(ModelBackend):
             return None
 
         try:
-            user = user_model.objects.get(
-                Q(username=username) | Q(email__iexact=username)
-            )
+            user = self.get_login_user(username)
         except user_model.DoesNotExist:
             user_model().set_password(password)
             return None
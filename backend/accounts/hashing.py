@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class HashingPoolBusy(Exception):
+    """
+    Raised when the pool already holds its maximum of running and queued jobs.
+    """
+
+
+class HashingPool:
+    """
+    Bounded worker pool for password hashing (PBKDF2 in ``check_password``,
+    ``set_password`` and ``create_user``).
+
+    hashlib releases the GIL while hashing, so threads give real parallelism
+    without pickling Django state into worker processes. At most
+    ``workers + queue_limit`` jobs are admitted; beyond that ``run`` fails
+    fast with ``HashingPoolBusy`` instead of letting requests pile up.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='auth-hash')
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def run(self, func, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolBusy()
+        try:
+            return await sync_to_async(
+                _run_job, thread_sensitive=False, executor=self._executor
+            )(func, *args, **kwargs)
+        finally:
+            self._slots.release()
+
+
+def _run_job(func, *args, **kwargs):
+    # Pool threads never see request_started/finished, so tidy DB connections here.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool() -> HashingPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    workers=settings.AUTH_HASHING_WORKERS,
+                    queue_limit=settings.AUTH_HASHING_QUEUE_LIMIT,
+                )
+    return _pool
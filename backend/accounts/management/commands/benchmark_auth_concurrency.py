@@ -0,0 +1,81 @@
+import asyncio
+import json
+import statistics
+import time
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncRequestFactory
+
+from accounts.async_views import AsyncCookieTokenObtainPairView
+from accounts.views import CookieTokenObtainPairView
+
+User = get_user_model()
+
+BENCH_USERNAME = 'bench_auth_user'
+BENCH_PASSWORD = 'bench-Auth-pass-9137'
+
+
+class UnthrottledSyncLogin(CookieTokenObtainPairView):
+    throttle_classes = ()
+
+
+class UnthrottledAsyncLogin(AsyncCookieTokenObtainPairView):
+    throttle_classes = ()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent logins/second of the sync DRF login view and the async '
+        'pool-backed one, both driven the way neo_lms.asgi runs them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50)
+
+    def handle(self, *args, **options):
+        user, created = User.objects.get_or_create(username=BENCH_USERNAME)
+        user.set_password(BENCH_PASSWORD)
+        user.save()
+        try:
+            # Under ASGI, sync views run on the request's thread-sensitive executor.
+            sync_view = sync_to_async(UnthrottledSyncLogin.as_view(), thread_sensitive=True)
+            async_view = UnthrottledAsyncLogin.as_view()
+            self.stdout.write(
+                f"{'path':>6} {'logins/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'ok':>5} {'503':>5}"
+            )
+            for name, view in (('sync', sync_view), ('async', async_view)):
+                self._report(name, asyncio.run(self._run(view, options['logins'], options['concurrency'])))
+        finally:
+            if created:
+                user.delete()
+
+    async def _run(self, view, logins, concurrency):
+        factory = AsyncRequestFactory()
+        body = json.dumps({'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+        gate = asyncio.Semaphore(concurrency)
+        latencies, statuses = [], []
+
+        async def login():
+            # Like ASGIHandler, give each request its own thread-sensitive context.
+            async with gate, ThreadSensitiveContext():
+                request = factory.post('/api/token/', body, content_type='application/json')
+                start = time.perf_counter()
+                response = await view(request)
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        return time.perf_counter() - started, latencies, statuses
+
+    def _report(self, name, result):
+        elapsed, latencies, statuses = result
+        ok = statuses.count(200)
+        p50 = statistics.median(latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else p50
+        self.stdout.write(
+            f'{name:>6} {ok / elapsed:>9.1f} {p50:>8.1f} {p95:>8.1f} {ok:>5} {statuses.count(503):>5}'
+        )
@@ -0,0 +1,104 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+User = get_user_model()
+
+MODES = ('per-request', 'persistent', 'pool')
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the /api/users/me/ query plus the end-of-request connection handling '
+        'with a new connection per request, persistent connections and a psycopg pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--threads', type=int, default=4, help='Concurrent simulated workers.')
+        parser.add_argument('--modes', default=','.join(MODES))
+
+    def handle(self, *args, **options):
+        if connections[DEFAULT_DB_ALIAS].vendor != 'postgresql':
+            raise CommandError('Connection setup cost is only meaningful on PostgreSQL.')
+        user_pk = User.objects.values_list('pk', flat=True).first()
+        if user_pk is None:
+            raise CommandError('Create at least one user first.')
+
+        self.stdout.write(
+            f"{'mode':>12} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'connects':>9}"
+        )
+        for mode in options['modes'].split(','):
+            latencies, opened = self._run(mode, user_pk, options['requests'], options['threads'])
+            cuts = statistics.quantiles(latencies, n=100)
+            self.stdout.write(
+                f'{mode:>12} {statistics.mean(latencies):>8.2f} {cuts[49]:>8.2f} '
+                f'{cuts[94]:>8.2f} {opened:>9}'
+            )
+
+    def _settings(self, mode, threads):
+        settings_dict = {
+            **connections[DEFAULT_DB_ALIAS].settings_dict,
+            'OPTIONS': {
+                key: value
+                for key, value in connections[DEFAULT_DB_ALIAS].settings_dict['OPTIONS'].items()
+                if key != 'pool'
+            },
+        }
+        if mode == 'per-request':
+            settings_dict['CONN_MAX_AGE'] = 0
+        elif mode == 'persistent':
+            settings_dict['CONN_MAX_AGE'] = 600
+        elif mode == 'pool':
+            settings_dict['CONN_MAX_AGE'] = 0
+            settings_dict['OPTIONS']['pool'] = {'min_size': threads, 'max_size': threads, 'timeout': 30}
+        else:
+            raise CommandError(f'Unknown mode {mode!r}; choose from {", ".join(MODES)}.')
+        return settings_dict
+
+    def _run(self, mode, user_pk, total, threads):
+        alias = f'benchmark_{mode}'
+        connections.settings[alias] = self._settings(mode, threads)
+        opened = 0
+        lock = threading.Lock()
+
+        def count_connect(sender, connection, **kwargs):
+            nonlocal opened
+            if connection.alias == alias:
+                with lock:
+                    opened += 1
+
+        def request(_):
+            connection = connections[alias]
+            started = time.perf_counter()
+            # Same work as a request: the lookup, then request_finished's cleanup.
+            list(User.objects.using(alias).filter(pk=user_pk))
+            connection.close_if_unusable_or_obsolete()
+            return (time.perf_counter() - started) * 1000
+
+        def worker(count):
+            try:
+                return [request(n) for n in range(count)]
+            finally:
+                connections[alias].close()
+
+        connection_created.connect(count_connect)
+        try:
+            share, extra = divmod(total, threads)
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                chunks = executor.map(worker, [share + (n < extra) for n in range(threads)])
+                latencies = [value for chunk in chunks for value in chunk]
+        finally:
+            connection_created.disconnect(count_connect)
+            if mode == 'pool':
+                # connection_created fires per checkout; the pool knows the real opens.
+                opened = connections[alias].pool.get_stats().get('connections_num', 0)
+                connections[alias].close_pool()
+            del connections.settings[alias]
+        return latencies, opened
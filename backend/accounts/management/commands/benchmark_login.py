@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from accounts.backends import EmailOrUsernameModelBackend
+
+User = get_user_model()
+
+BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure login lookup latency (username and email) while the user table '
+        'grows. Runs inside a transaction that is rolled back unless --keep.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10000,100000,1000000',
+            help='Comma separated user-table sizes to measure at.',
+        )
+        parser.add_argument('--lookups', type=int, default=500, help='Lookups per size.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated users.')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        rng = random.Random(options['seed'])
+        backend = EmailOrUsernameModelBackend()
+
+        self.stdout.write(f"{'users':>10} {'kind':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        with transaction.atomic():
+            created = 0
+            for size in sizes:
+                created = self._grow_to(size, created)
+                self._analyze()
+                for kind in ('username', 'email'):
+                    timings = self._measure(backend, kind, created, options['lookups'], rng)
+                    self.stdout.write(
+                        f'{size:>10} {kind:>9} {self._pct(timings, 50):>8.3f} '
+                        f'{self._pct(timings, 95):>8.3f} {max(timings):>8.3f}'
+                    )
+            self._explain(created - 1)
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def _grow_to(self, size, created):
+        while created < size:
+            batch = range(created, min(size, created + BATCH_SIZE))
+            User.objects.bulk_create(
+                [
+                    User(
+                        username=f'bench_login_{i}',
+                        email=f'Bench.Login.{i}@example.com',
+                        password='!',
+                    )
+                    for i in batch
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            created = batch.stop
+        return created
+
+    def _measure(self, backend, kind, created, lookups, rng):
+        timings = []
+        for _ in range(lookups):
+            i = rng.randrange(created)
+            identifier = f'bench_login_{i}' if kind == 'username' else f'bench.login.{i}@EXAMPLE.com'
+            start = time.perf_counter()
+            backend.get_login_user(identifier)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _analyze(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {User._meta.db_table}')
+
+    def _explain(self, i):
+        if connection.vendor != 'postgresql':
+            return
+        plan = User.objects.filter_by_email(f'bench.login.{i}@example.com').explain()
+        self.stdout.write('\nEXPLAIN email lookup:\n' + plan)
+
+    @staticmethod
+    def _pct(values, pct):
+        return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else values[0]
@@ -0,0 +1,54 @@
+import accounts.models
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Stop before the constraint if emails collide when compared case-insensitively.
+
+    Which account keeps a shared address is a decision for an operator, so
+    nothing is changed here; the message lists what to fix.
+    """
+    User = apps.get_model('accounts', 'User')
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias)
+        .exclude(email='')
+        .values(email_lower=Lower('email'))
+        .annotate(n=Count('pk'))
+        .filter(n__gt=1)
+        .order_by('email_lower')
+        .values_list('email_lower', flat=True)
+    )
+    if duplicates:
+        shown = ', '.join(duplicates[:20])
+        more = f' and {len(duplicates) - 20} more' if len(duplicates) > 20 else ''
+        raise RuntimeError(
+            f'Cannot add user_email_lower_uniq: {len(duplicates)} email address(es) are used by '
+            f'several accounts when case is ignored ({shown}{more}). Give each account a distinct '
+            f'email, or clear it on the accounts that should not keep it, then migrate again.'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', accounts.models.UserManager()),
+            ],
+        ),
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='user_email_lower_uniq'),
+        ),
+    ]
@@ -1,5 +1,19 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
+
+
+class UserManager(BaseUserManager):
+    def filter_by_email(self, email: str):
+        """
+        Case-insensitive email match served by the LOWER(email) unique index.
+
+        The ``email <> ''`` clause repeats the index predicate so the planner
+        can use the partial index.
+        """
+        return self.filter(Exact(Lower('email'), email.strip().lower())).exclude(email='')
 
 
 class User(AbstractUser):
@@ -14,6 +28,17 @@ class User(AbstractUser):
         default=Roles.STUDENT,
     )
 
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                Lower('email'),
+                name='user_email_lower_uniq',
+                condition=~Q(email=''),
+            ),
+        ]
+
     @property
     def is_student(self) -> bool:
         return self.role == self.Roles.STUDENT
@@ -25,3 +50,29 @@ class User(AbstractUser):
     @property
     def is_admin(self) -> bool:
         return self.role == self.Roles.ADMIN
+
+
+class Activity(models.Model):
+    """
+    One row per user, kind and flush interval, written in bulk by
+    ``accounts.activity.flush``; backs the per-user activity feed.
+    """
+
+    class Kinds(models.TextChoices):
+        LOGIN = "login", "Login"
+        REFRESH = "refresh", "Session refresh"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='activities')
+    kind = models.CharField(max_length=20, choices=Kinds.choices)
+    # Latest occurrence within the interval.
+    at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = 'activities'
+        indexes = [
+            models.Index(fields=['user', '-at'], name='activity_user_at_idx'),
+            models.Index(fields=['at'], name='activity_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} {self.kind} {self.at:%Y-%m-%d %H:%M}'
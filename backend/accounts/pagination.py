@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ActivityCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the activity feed, newest first.
+    """
+
+    ordering = ('-at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
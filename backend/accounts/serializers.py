@@ -3,7 +3,14 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password  # <--- این ایمپورت مهم است
 from django.core import exceptions as django_exceptions
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from neo_lms.utils.serializers import JalaliFieldsMixin
+
+from . import activity
+from .models import Activity
 
 User = get_user_model()
 
@@ -21,7 +28,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value):
         normalized_email = value.strip().lower()
-        if User.objects.filter(email__iexact=normalized_email).exists():
+        if User.objects.filter_by_email(normalized_email).exists():
             raise serializers.ValidationError("این ایمیل قبلاً ثبت شده است.")
         return normalized_email
 
@@ -37,18 +44,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         role = validated_data.pop('role', User.Roles.STUDENT)
-        user = User.objects.create_user(
+        # Single INSERT: role and staff flag go in with the row.
+        return User.objects.create_user(
             username=validated_data['username'],
             email=validated_data['email'],
             password=validated_data['password'],
             first_name=validated_data.get('first_name', ''),
-            last_name=validated_data.get('last_name', '')
+            last_name=validated_data.get('last_name', ''),
+            role=role,
+            is_staff=role == User.Roles.ADMIN,
         )
-        user.role = role
-        if user.role == User.Roles.ADMIN:
-            user.is_staff = True
-        user.save()
-        return user
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -57,13 +62,63 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'role')
 
 
+class ActivitySerializer(JalaliFieldsMixin, serializers.ModelSerializer):
+    kind_display = serializers.CharField(source='get_kind_display', read_only=True)
+
+    class Meta:
+        model = Activity
+        fields = ('id', 'kind', 'kind_display', 'at')
+        jalali_fields = ('at',)
+
+
 class PersianTokenObtainPairSerializer(TokenObtainPairSerializer):
     default_error_messages = {
         'no_active_account': 'نام کاربری یا رمز عبور اشتباه است.'
     }
 
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        # UPDATE_LAST_LOGIN is off; last_login is written by the activity flush.
+        activity.record(self.user.pk, Activity.Kinds.LOGIN)
+        return data
+
+    @classmethod
+    def get_token(cls, user):
+        # Claims read by CookieJWTAuthentication when AUTH_TOKEN_USER is on.
+        token = super().get_token(user)
+        token['role'] = user.role
+        token['is_active'] = user.is_active
+        return token
+
 
 class PersianTokenRefreshSerializer(TokenRefreshSerializer):
     default_error_messages = {
-        'token_not_valid': 'توکن شما منقضی شده یا معتبر نیست.'
+        'token_not_valid': 'توکن شما منقضی شده یا معتبر نیست.',
+        'no_active_account': 'حساب کاربری غیرفعال است.',
     }
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.get(jwt_settings.USER_ID_CLAIM)
+        user = None
+        if user_id is not None:
+            user = User.objects.filter(
+                **{jwt_settings.USER_ID_FIELD: user_id}
+            ).only('pk', 'role', 'is_active').first()
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+
+        # The access token copies the refresh token's claims, which date from
+        # login; re-stamp them from the current row.
+        refresh['role'] = user.role
+        refresh['is_active'] = user.is_active
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        activity.record(user.pk, Activity.Kinds.REFRESH)
+        return data
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+from jobs.queue import task
+
+from . import activity
+
+
+@task('accounts.flush_activity', every=settings.ACTIVITY_FLUSH_INTERVAL)
+def flush_activity():
+    # Drains the shared-cache buffer (ACTIVITY_BUFFER) and purges old rows.
+    activity.flush()
@@ -1,3 +1,186 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from jobs.models import Job
+from neo_lms.db_pool import pool_stats
+from neo_lms.utils import throttling
+
+from . import activity
+from .authentication import get_cached_user
+from .models import Activity
+
+User = get_user_model()
+
+
+class SlidingWindowStoreTests(APITestCase):
+    """
+    The local stand-in implements the same sliding-window counter as Redis.
+    """
+
+    def test_previous_window_weighs_in_proportionally(self):
+        store = throttling.LocalWindowStore()
+        for _ in range(10):
+            self.assertTrue(store.hit('k', 10, 60, 0)[0])
+        self.assertFalse(store.hit('k', 10, 60, 30)[0])
+        # Halfway through the next window the previous 10 count as 5.
+        results = [store.hit('k', 10, 60, 90)[0] for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_keys_are_bounded(self):
+        store = throttling.LocalWindowStore(max_keys=3)
+        for n in range(5):
+            store.hit(f'k{n}', 10, 60, 0)
+        self.assertEqual(list(store._counters), ['k2', 'k3', 'k4'])
+
+
+class TokenThrottleScopeTests(APITestCase):
+    """
+    Login and refresh have their own budgets, separate from each other and anon.
+    """
+
+    def setUp(self):
+        self.store = throttling.LocalWindowStore()
+        patcher = mock.patch.object(throttling, '_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        User.objects.create_user('student', 'student@example.com', 'pass')
+
+    @mock.patch.dict(throttling.LoginRateThrottle.THROTTLE_RATES, {'login': '2/minute'})
+    def test_login_scope(self):
+        credentials = {'username': 'student', 'password': 'wrong'}
+        statuses = [self.client.post('/api/token/', credentials).status_code for _ in range(3)]
+        self.assertEqual(statuses, [401, 401, 429])
+        # Refresh and the anon catalog budget are untouched.
+        self.assertEqual(self.client.post('/api/token/refresh/').status_code, 401)
+        self.assertEqual(self.client.get('/api/courses/').status_code, 200)
+
+    @mock.patch.dict(throttling.RefreshRateThrottle.THROTTLE_RATES, {'refresh': '1/minute'})
+    def test_refresh_scope(self):
+        self.assertEqual(self.client.post('/api/token/refresh/').status_code, 401)
+        response = self.client.post('/api/token/refresh/')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+
+@override_settings(ACTIVITY_BUFFER=True, ACTIVITY_FLUSH_INTERVAL=60)
+class ActivityBufferTests(APITestCase):
+    """
+    Logins are buffered in the cache and written once per user per interval.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('student', 'student@example.com', 'pass')
+
+    def test_logins_are_coalesced_into_one_write(self):
+        for _ in range(3):
+            response = self.client.post('/api/token/', {'username': 'student', 'password': 'pass'})
+            self.assertEqual(response.status_code, 200)
+        self.assertFalse(Job.objects.exists())
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+
+        # Users, bulk last_login, bulk insert, and the once-a-day purge.
+        with self.assertNumQueries(4):
+            written = activity.flush(now=time.time() + 60)
+        self.assertEqual(written, 1)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(activity.flush(now=time.time() + 60), 0)
+
+        self.client.force_authenticate(self.user)
+        results = self.client.get('/api/users/me/activity/').data['results']
+        self.assertEqual([row['kind'] for row in results], ['login'])
+        self.assertEqual(parse_datetime(results[0]['at']), self.user.last_login)
+
+    def test_current_interval_is_left_for_the_next_flush(self):
+        activity.record(self.user.pk, Activity.Kinds.REFRESH)
+        self.assertEqual(activity.flush(), 0)
+        self.assertEqual(activity.flush(now=time.time() + 60), 1)
+
+
+@override_settings(ACTIVITY_BUFFER=False)
+class LocalActivityBufferTests(APITestCase):
+    """
+    Without a shared cache, logins and refreshes are buffered in process memory.
+    """
+
+    def setUp(self):
+        self.buffer = activity.local_buffer(interval=60)
+        patcher = mock.patch.object(activity, '_local_buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user('student', 'student@example.com', 'pass')
+
+    def test_no_write_until_flush(self):
+        credentials = {'username': 'student', 'password': 'pass'}
+        with self.assertNumQueries(1):  # the credential lookup only
+            self.assertEqual(self.client.post('/api/token/', credentials).status_code, 200)
+        self.client.post('/api/token/', credentials)
+        with self.assertNumQueries(1):  # the claims lookup only
+            self.assertEqual(self.client.post('/api/token/refresh/').status_code, 200)
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(Activity.objects.exists())
+
+        # One row per user and kind, however many events.
+        self.assertEqual(self.buffer.flush(), 2)
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+        self.assertEqual(self.buffer.flush(), 0)
+
+
+class TokenRefreshClaimsTests(APITestCase):
+    """
+    Refreshed access tokens carry the user's current role and status.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            'teacher', 'teacher@example.com', 'pass', role=User.Roles.INSTRUCTOR
+        )
+        self.client.post('/api/token/', {'username': 'teacher', 'password': 'pass'})
+
+    def test_role_is_restamped(self):
+        User.objects.filter(pk=self.user.pk).update(role=User.Roles.STUDENT)
+        self.assertEqual(self.client.post('/api/token/refresh/').status_code, 200)
+        access = AccessToken(self.client.cookies['access_token'].value)
+        self.assertEqual(access['role'], User.Roles.STUDENT)
+
+    def test_inactive_user_is_rejected(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.post('/api/token/refresh/').status_code, 401)
+
+    def test_cached_user_has_no_password(self):
+        cache.clear()
+        self.assertEqual(get_cached_user(self.user.pk).role, User.Roles.INSTRUCTOR)
+        self.assertNotIn(self.user.password, repr(cache.get(f'accounts:user:{self.user.pk}')))
+
+
+class DatabasePoolStatsTests(APITestCase):
+    """
+    /api/health/db/ reports persistent-connection settings for unpooled aliases.
+    """
+
+    def test_unpooled_alias(self):
+        stats = pool_stats()
+        self.assertEqual(stats['default']['pooled'], False)
+        self.assertIn('conn_max_age', stats['default'])
+        self.assertIn('health_checks', stats['default'])
+
+    def test_admin_only(self):
+        user = User.objects.create_user('student', 'student@example.com', 'pass')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.client.get('/api/health/db/').status_code, 403)
+
+        admin = User.objects.create_user('admin', 'admin@example.com', 'pass', role=User.Roles.ADMIN)
+        self.client.force_authenticate(admin)
+        response = self.client.get('/api/health/db/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['default']['pooled'])
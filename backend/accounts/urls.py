@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.urls import path
+
+from .async_views import AsyncRegisterView
 from .views import RegisterView
 
+register_view = AsyncRegisterView if settings.AUTH_ASYNC_VIEWS else RegisterView
+
 urlpatterns = [
-    path('register/', RegisterView.as_view(), name='register'),
-]
\ No newline at end of file
+    path('register/', register_view.as_view(), name='register'),
+]
@@ -8,7 +8,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from neo_lms.db_router import ReplicaReadMixin
+from neo_lms.utils.throttling import LoginRateThrottle, RefreshRateThrottle
+from neo_lms.utils.timing import SerializerTimingMixin
+
+from .authentication import resolve_user
+from .models import Activity
+from .pagination import ActivityCursorPagination
 from .serializers import (
+    ActivitySerializer,
     PersianTokenObtainPairSerializer,
     PersianTokenRefreshSerializer,
     UserRegistrationSerializer,
@@ -47,7 +55,7 @@ def _attach_tokens(response: Response, access: str, refresh: Optional[str] = Non
         )
 
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(SerializerTimingMixin, generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
     serializer_class = UserRegistrationSerializer
@@ -55,6 +63,7 @@ class RegisterView(generics.CreateAPIView):
 
 class CookieTokenObtainPairView(TokenObtainPairView):
     permission_classes = (AllowAny,)
+    throttle_classes = (LoginRateThrottle,)
     serializer_class = PersianTokenObtainPairSerializer
 
     def post(self, request, *args, **kwargs):
@@ -70,6 +79,7 @@ class CookieTokenObtainPairView(TokenObtainPairView):
 
 class CookieTokenRefreshView(TokenRefreshView):
     permission_classes = (AllowAny,)
+    throttle_classes = (RefreshRateThrottle,)
     serializer_class = PersianTokenRefreshSerializer
 
     def post(self, request, *args, **kwargs):
@@ -98,9 +108,27 @@ class LogoutView(APIView):
         return response
 
 
-class UserMeView(generics.RetrieveAPIView):
+class UserMeView(SerializerTimingMixin, ReplicaReadMixin, generics.RetrieveAPIView):
     serializer_class = UserSerializer
+    replica_actions = ('get',)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        return resolve_user(self.request.user)
+
+
+class ActivityFeedView(SerializerTimingMixin, ReplicaReadMixin, generics.ListAPIView):
+    """
+    The current user's recent logins and session refreshes, newest first.
+
+    Rows arrive with the periodic activity flush, so the newest events may
+    lag by up to ACTIVITY_FLUSH_INTERVAL seconds.
+    """
+
+    serializer_class = ActivitySerializer
+    replica_actions = ('get',)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = ActivityCursorPagination
+
+    def get_queryset(self):
+        return Activity.objects.filter(user_id=self.request.user.pk)
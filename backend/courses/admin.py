@@ -1,7 +1,15 @@
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db.models import Q
 
-from neo_lms.utils.jalali import format_jalali
+from neo_lms.utils.admin import (
+    JalaliColumnsMixin,
+    LargeTableAdminMixin,
+    ReplicaChangelistMixin,
+    autocomplete_filter,
+)
 
+from . import tasks as course_tasks
 from .models import Course, Enrollment, Lesson, Module
 
 
@@ -16,39 +24,91 @@ class ModuleInline(admin.StackedInline):
 
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
-    list_display = ('title', 'instructor', 'price', 'is_published', 'created_at_jalali')
+class CourseAdmin(ReplicaChangelistMixin, JalaliColumnsMixin, admin.ModelAdmin):
+    list_display = (
+        'title',
+        'instructor',
+        'price',
+        'is_published',
+        'lesson_count',
+        'enrollment_count',
+        'created_at_jalali',
+    )
     list_filter = ('is_published', 'created_at')
     search_fields = ('title', 'slug', 'instructor__username')
     prepopulated_fields = {'slug': ('title',)}
     inlines = (ModuleInline,)
+    jalali_fields = ('created_at',)
+    actions = ('rebuild_course_data', 'regenerate_image_variants')
 
     @admin.display(description="Created (Jalali)", ordering="created_at")
     def created_at_jalali(self, obj):
-        return format_jalali(obj.created_at)
+        return self.jalali_value(obj, 'created_at')
+
+    @admin.action(description="Rebuild counters and search index (background)")
+    def rebuild_course_data(self, request, queryset):
+        course_ids = list(queryset.values_list('pk', flat=True))
+        course_tasks.rebuild_course_data.enqueue(course_ids=course_ids)
+        self.message_user(request, f"Queued a rebuild of {len(course_ids)} course(s).")
+
+    @admin.action(description="Regenerate image variants (background)")
+    def regenerate_image_variants(self, request, queryset):
+        course_ids = list(queryset.exclude(image='').values_list('pk', flat=True))
+        for course_id in course_ids:
+            course_tasks.generate_image_variants.enqueue(course_id=course_id)
+        self.message_user(request, f"Queued image variants for {len(course_ids)} course(s).")
 
 
 @admin.register(Module)
-class ModuleAdmin(admin.ModelAdmin):
+class ModuleAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'course', 'order')
-    list_filter = ('course',)
+    list_filter = (autocomplete_filter('course'),)
+    list_select_related = ('course',)
+    search_fields = ('title',)
+    autocomplete_fields = ('course',)
     inlines = (LessonInline,)
-    ordering = ('course', 'order')
+    ordering = ('course_id', 'order')
 
 
 @admin.register(Lesson)
-class LessonAdmin(admin.ModelAdmin):
+class LessonAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ('title', 'module', 'order', 'is_free')
-    list_filter = ('module', 'is_free')
-    ordering = ('module', 'order')
+    list_filter = (autocomplete_filter('module'), 'is_free')
+    # Module.__str__ reads its course title.
+    list_select_related = ('module__course',)
+    search_fields = ('title',)
+    autocomplete_fields = ('module',)
+    ordering = ('module_id', 'order')
 
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(LargeTableAdminMixin, JalaliColumnsMixin, admin.ModelAdmin):
     list_display = ('user', 'course', 'enrolled_at_jalali')
-    list_filter = ('course', 'enrolled_at')
-    search_fields = ('user__username', 'course__title')
+    list_filter = (autocomplete_filter('course'), autocomplete_filter('user'), 'enrolled_at')
+    list_select_related = ('user', 'course')
+    search_fields = ('user__username', 'user__email', 'course__title')
+    search_help_text = "Username prefix, exact email, or part of a course title."
+    autocomplete_fields = ('user', 'course')
+    jalali_fields = ('enrolled_at',)
 
     @admin.display(description="Enrolled (Jalali)", ordering="enrolled_at")
     def enrolled_at_jalali(self, obj):
-        return format_jalali(obj.enrolled_at)
+        return self.jalali_value(obj, 'enrolled_at')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Resolve the term against users and courses first, so enrollments are
+        matched through their user/course indexes instead of a joined ILIKE scan.
+        """
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        User = get_user_model()
+        if '@' in term:
+            users = User.objects.filter_by_email(term)
+        else:
+            users = User.objects.filter(username__startswith=term)
+        courses = Course.objects.filter(title__icontains=term)
+        return queryset.filter(
+            Q(user__in=users.values('pk')) | Q(course__in=courses.values('pk'))
+        ), False
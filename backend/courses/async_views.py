@@ -0,0 +1,113 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+
+from neo_lms.db_router import replica_reads
+from neo_lms.utils.async_views import AsyncAPIView, error_payload, json_response
+
+from . import search as course_search
+from .models import Course
+from .pagination import CourseCursorPagination, CourseKeyset
+from .serializers import CourseSerializer, CourseSummarySerializer
+from .views import CourseViewSet
+
+
+class AsyncCourseView(AsyncAPIView):
+    """
+    Async-ORM read path for the catalog; writes go to ``CourseViewSet``.
+
+    Only GET/HEAD run here, through the subclass's ``get``. Other methods are
+    handed to the DRF view on the thread-sensitive executor, exactly as
+    Django would run it under ASGI.
+    """
+
+    viewset_actions = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            fallback = CourseViewSet.as_view(self.viewset_actions)
+            return await sync_to_async(fallback)(request, *args, **kwargs)
+
+        try:
+            user = await self.authenticate(request)
+        except AuthenticationFailed as exc:
+            return json_response(error_payload(exc.detail), exc.status_code)
+
+        throttled = await self.check_throttles(request, user)
+        if throttled is not None:
+            return throttled
+        with replica_reads():
+            return await self.get(request, user, *args, **kwargs)
+
+    def get_queryset(self, user):
+        return (
+            Course.objects.visible_to(user)
+            .select_related('instructor')
+            .defer('search_vector')
+        )
+
+
+class AsyncCourseListView(AsyncCourseView):
+    viewset_actions = {'get': 'list', 'post': 'create'}
+
+    def page_size(self, request):
+        try:
+            size = int(request.GET.get('page_size', CourseCursorPagination.page_size))
+        except ValueError:
+            size = CourseCursorPagination.page_size
+        return max(1, min(size, CourseCursorPagination.max_page_size))
+
+    async def get(self, request, user, *args, **kwargs):
+        queryset = self.get_queryset(user)
+        size = self.page_size(request)
+        query = request.GET.get('q', '').strip()
+
+        if query:
+            try:
+                page = max(1, int(request.GET.get('page', 1)))
+            except ValueError:
+                page = 1
+            queryset = course_search.search(queryset, query)[(page - 1) * size:page * size + 1]
+            courses = [course async for course in queryset]
+            next_url = self._link(request, page=page + 1) if len(courses) > size else None
+        else:
+            cursor = request.GET.get('cursor')
+            if cursor:
+                try:
+                    queryset = queryset.filter(CourseKeyset.after(CourseKeyset.decode(cursor)))
+                except ValueError:
+                    return json_response({'detail': 'مکان‌نمای نامعتبر.'}, status.HTTP_404_NOT_FOUND)
+            queryset = queryset.order_by(*CourseKeyset.ordering)[:size + 1]
+            courses = [course async for course in queryset.aiterator()]
+            next_url = (
+                self._link(request, cursor=CourseKeyset.encode(courses[size - 1]))
+                if len(courses) > size
+                else None
+            )
+
+        data = CourseSummarySerializer(courses[:size], many=True, context={'request': request}).data
+        return json_response({'next': next_url, 'previous': None, 'results': data})
+
+    def _link(self, request, **params):
+        query = request.GET.copy()
+        for key, value in params.items():
+            query[key] = value
+        return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+class AsyncCourseDetailView(AsyncCourseView):
+    viewset_actions = {
+        'get': 'retrieve',
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy',
+    }
+
+    async def get(self, request, user, pk, *args, **kwargs):
+        queryset = self.get_queryset(user).with_outline()
+        try:
+            course = await queryset.aget(pk=pk)
+        except Course.DoesNotExist:
+            return json_response({'detail': NotFound.default_detail}, status.HTTP_404_NOT_FOUND)
+        data = CourseSerializer(course, context={'request': request}).data
+        return json_response(data)
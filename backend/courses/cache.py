@@ -0,0 +1,124 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+User = get_user_model()
+
+CACHE_PREFIX = 'courses'
+LIST_VERSION_KEY = f'{CACHE_PREFIX}:version:list'
+CHANGED_AT_KEY = f'{CACHE_PREFIX}:changed-at'
+HITS_KEY = f'{CACHE_PREFIX}:stats:hits'
+MISSES_KEY = f'{CACHE_PREFIX}:stats:misses'
+
+
+def visibility_partition(user) -> str:
+    """
+    Map a requester to one of the visibility classes used by CourseViewSet.
+    """
+    role = getattr(user, 'role', None) if user and user.is_authenticated else None
+    if role == User.Roles.ADMIN:
+        return 'admin'
+    if role == User.Roles.INSTRUCTOR:
+        return f'instructor:{user.pk}'
+    return 'public'
+
+
+def _course_version_key(course_id) -> str:
+    return f'{CACHE_PREFIX}:version:course:{course_id}'
+
+
+def _get_version(key: str) -> int:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def _bump(key: str):
+    cache.add(key, 1, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key was evicted between add() and incr(); any fresh value works.
+        cache.set(key, 1, None)
+
+
+def _request_fingerprint(request) -> str:
+    raw = f'{request.get_host()}{request.get_full_path()}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def list_key(request) -> str:
+    version = _get_version(LIST_VERSION_KEY)
+    partition = visibility_partition(request.user)
+    return f'{CACHE_PREFIX}:list:{version}:{partition}:{_request_fingerprint(request)}'
+
+
+def detail_key(request, course_id) -> str:
+    version = _get_version(_course_version_key(course_id))
+    partition = visibility_partition(request.user)
+    return (
+        f'{CACHE_PREFIX}:detail:{course_id}:{version}:{partition}:'
+        f'{_request_fingerprint(request)}'
+    )
+
+
+def get_cached(key: str):
+    data = cache.get(key)
+    _count(HITS_KEY if data is not None else MISSES_KEY)
+    return data
+
+
+def store(key: str, data):
+    cache.set(key, data, settings.COURSE_CACHE_TIMEOUT)
+
+
+def invalidate_course(course_id):
+    """
+    Drop the cached catalog pages and the cached detail of a single course.
+    """
+    cache.set(CHANGED_AT_KEY, timezone.now(), None)
+    _bump(LIST_VERSION_KEY)
+    if course_id is not None:
+        _bump(_course_version_key(course_id))
+
+
+def changed_at():
+    """
+    When a course, module or lesson was last saved or deleted.
+
+    Unknown after a cache flush; then the current time is recorded, so the
+    value never moves backwards.
+    """
+    now = timezone.now()
+    cache.add(CHANGED_AT_KEY, now, None)
+    return cache.get(CHANGED_AT_KEY, now)
+
+
+def _count(key: str):
+    if cache.add(key, 1, None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def stats() -> dict:
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
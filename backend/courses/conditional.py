@@ -0,0 +1,35 @@
+import hashlib
+
+from django.db.models import Count, Max
+
+from . import cache as course_cache
+from .models import Lesson, Module
+
+
+def course_validators(courses, salt: str = ''):
+    """
+    Build an (ETag, Last-Modified) pair for a set of visible courses.
+
+    Only counts and max(updated_at) of the courses, their modules and their
+    lessons are read, so no rows are fetched or serialized. Deleting or
+    unpublishing leaves the remaining timestamps untouched, so the catalog's
+    last change time from ``cache.changed_at`` is folded into both validators.
+    """
+    course_stats = courses.order_by().aggregate(count=Count('pk'), last=Max('updated_at'))
+    module_stats = Module.objects.filter(course__in=courses.values('pk')).aggregate(
+        count=Count('pk'), last=Max('updated_at')
+    )
+    lesson_stats = Lesson.objects.filter(
+        module__course__in=courses.values('pk')
+    ).aggregate(count=Count('pk'), last=Max('updated_at'))
+
+    stats = (course_stats, module_stats, lesson_stats)
+    changed_at = course_cache.changed_at()
+    last_modified = max([changed_at] + [s['last'] for s in stats if s['last'] is not None])
+
+    raw = '|'.join(
+        [salt, changed_at.isoformat()]
+        + [f"{s['count']}:{s['last'].isoformat() if s['last'] else '-'}" for s in stats]
+    )
+    etag = f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+    return etag, last_modified
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import stats as course_stats
+from .models import Enrollment
+
+BULK_BATCH_SIZE = 1000
+
+
+def _insert_sql(count):
+    """
+    INSERT ... SELECT of the active users among ``count`` ids that skips
+    existing enrollments; RETURNING yields only the rows actually inserted,
+    so concurrent enrollments cannot skew the count.
+    """
+    User = get_user_model()
+    qn = connection.ops.quote_name
+    meta = Enrollment._meta
+    columns = [
+        qn(meta.get_field(name).column)
+        for name in ('user', 'course', 'enrolled_at', 'progress_seconds', 'completed_lessons')
+    ]
+    user_pk = qn(User._meta.pk.column)
+    return (
+        f'INSERT INTO {qn(meta.db_table)} ({", ".join(columns)}) '
+        f'SELECT {user_pk}, %s, %s, 0, 0 FROM {qn(User._meta.db_table)} '
+        f'WHERE {user_pk} IN ({", ".join(["%s"] * count)}) '
+        f'AND {qn(User._meta.get_field("is_active").column)} '
+        f'ON CONFLICT ({columns[0]}, {columns[1]}) DO NOTHING '
+        f'RETURNING {qn(meta.pk.column)}'
+    )
+
+
+def bulk_enroll(course, user_ids, batch_size: int = BULK_BATCH_SIZE):
+    """
+    Enroll many users into ``course`` with batched ``INSERT ... ON CONFLICT DO NOTHING``.
+
+    Existing enrollments are left alone thanks to the (user, course) unique
+    constraint, so repeating a request is harmless. Returns ``(created, skipped)``;
+    unknown or inactive user ids count as skipped.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    created = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(user_ids), batch_size):
+            chunk = user_ids[start:start + batch_size]
+            cursor.execute(_insert_sql(len(chunk)), [course.pk, now, *chunk])
+            created += len(cursor.fetchall())
+        # Raw inserts skip post_save, so keep the counter in step by hand.
+        course_stats.adjust(course.pk, enrollment_count=created)
+    return created, len(user_ids) - created
@@ -0,0 +1,68 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import cache as course_cache
+from .models import Course
+
+# name: (width, height, Pillow format, file extension, save options)
+VARIANTS = {
+    'card': (640, 360, 'JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'card_webp': (640, 360, 'WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'thumbnail': (240, 135, 'JPEG', 'jpg', {'quality': 80, 'optimize': True, 'progressive': True}),
+    'thumbnail_webp': (240, 135, 'WEBP', 'webp', {'quality': 78, 'method': 4}),
+}
+VARIANT_DIR = 'course_images/variants'
+
+
+def variant_name(source_name: str, variant: str) -> str:
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    return f'{VARIANT_DIR}/{stem}_{variant}.{VARIANTS[variant][3]}'
+
+
+def render_variants(source):
+    """
+    Yield ``(variant, bytes)`` for every entry of VARIANTS from an open image file.
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+    for variant, (width, height, fmt, _, options) in VARIANTS.items():
+        resized = ImageOps.fit(image, (width, height), method=Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        resized.save(buffer, format=fmt, **options)
+        yield variant, buffer.getvalue()
+
+
+def generate_variants(course_id, storage=default_storage):
+    """
+    Write the resized/re-encoded variants of a course image and record them.
+
+    Returns the stored ``{variant: name}`` mapping, or ``None`` when the
+    course has no image or it changed while rendering.
+    """
+    course = Course.objects.filter(pk=course_id).only('pk', 'image').first()
+    if course is None or not course.image:
+        return None
+
+    source_name = course.image.name
+    stored = {}
+    with storage.open(source_name, 'rb') as source:
+        for variant, data in render_variants(source):
+            name = variant_name(source_name, variant)
+            if storage.exists(name):
+                storage.delete(name)
+            stored[variant] = storage.save(name, ContentFile(data))
+
+    # Skip the write if a newer upload replaced the image meanwhile.
+    updated = Course.objects.filter(pk=course_id, image=source_name).update(
+        image_variants=stored,
+        updated_at=timezone.now(),
+    )
+    if not updated:
+        return None
+    course_cache.invalidate_course(course_id)
+    return stored
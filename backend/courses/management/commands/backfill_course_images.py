@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from courses import images as course_images
+from courses.models import Course
+
+
+def _generate(course_id):
+    close_old_connections()
+    try:
+        return course_images.generate_variants(course_id)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Generate the resized/WebP variants for existing course images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Images rendered in parallel (Pillow releases the GIL while resizing/encoding).',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Regenerate courses that already have variants.',
+        )
+
+    def handle(self, *args, **options):
+        courses = Course.objects.exclude(image='')
+        if not options['force']:
+            courses = courses.filter(image_variants={})
+        course_ids = list(courses.values_list('pk', flat=True))
+
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+            futures = {executor.submit(_generate, pk): pk for pk in course_ids}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'Course {futures[future]}: {exc}')
+                else:
+                    done += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated variants for {done} course(s), {failed} failed.'
+        ))
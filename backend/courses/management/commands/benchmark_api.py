@@ -0,0 +1,167 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from courses import cache as course_cache
+from courses.models import Course, Enrollment, Lesson, Module
+from neo_lms.utils.admin import estimate_count
+from neo_lms.utils.throttling import SlidingWindowThrottleMixin
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the main API endpoints and admin changelists against the current '
+        'data (see seed_lms) and write latency percentiles, query counts and peak '
+        'memory per endpoint to JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--username', default='seed_student0', help='User for /api/token/ and authenticated reads.')
+        parser.add_argument('--password', default='seed-pass')
+        parser.add_argument('--admin', default='seed_admin', help='Superuser for the admin changelists.')
+        parser.add_argument('--with-cache', action='store_true', help='Keep the catalog response cache on.')
+        parser.add_argument('--only', help='Comma separated endpoint names to run.')
+        parser.add_argument('--label', default='')
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument('--compare', help='Earlier JSON result to diff against.')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        admin_user = User.objects.filter(username=options['admin'], is_superuser=True).first()
+        course = Course.objects.filter(is_published=True).order_by('-enrollment_count').first()
+        if user is None or admin_user is None or course is None:
+            raise CommandError('Seed data is missing; run "manage.py seed_lms" first.')
+
+        lesson_id = Lesson.objects.filter(module__course=course).values_list('pk', flat=True).first()
+        heartbeat = {'lesson': lesson_id, 'position': 30}
+
+        api = Client()
+        login = {'username': options['username'], 'password': options['password']}
+        if api.post('/api/token/', login, content_type='application/json').status_code != 200:
+            raise CommandError(f'Could not log in as {options["username"]}.')
+        anonymous = Client()
+        admin = Client()
+        admin.force_login(admin_user)
+
+        endpoints = {
+            'courses.list': lambda: anonymous.get('/api/courses/'),
+            'courses.search': lambda: anonymous.get('/api/courses/', {'q': 'python'}),
+            'courses.detail': lambda: anonymous.get(f'/api/courses/{course.pk}/'),
+            'token': lambda: Client().post('/api/token/', login, content_type='application/json'),
+            'users.me': lambda: api.get('/api/users/me/'),
+            'enrollments.mine': lambda: api.get('/api/courses/enrollments/'),
+            # Buffered: measures the request path, not the periodic bulk write.
+            'progress.heartbeat': lambda: api.post(
+                '/api/courses/progress/', heartbeat, content_type='application/json'
+            ),
+            'admin.enrollments': lambda: admin.get('/admin/courses/enrollment/'),
+            'admin.courses': lambda: admin.get('/admin/courses/course/'),
+            'admin.modules': lambda: admin.get('/admin/courses/module/'),
+            'admin.lessons': lambda: admin.get('/admin/courses/lesson/'),
+            'admin.users': lambda: admin.get('/admin/accounts/user/'),
+        }
+        if options['only']:
+            wanted = options['only'].split(',')
+            endpoints = {name: call for name, call in endpoints.items() if name in wanted}
+
+        cache_timeout = {}
+        if not options['with_cache']:
+            # Nothing new gets stored; drop what is there so every read hits the DB.
+            cache_timeout = {'COURSE_CACHE_TIMEOUT': 0}
+            course_cache.invalidate_course(course.pk)
+        results = {}
+        # Throttling would turn most timed requests into 429s.
+        with override_settings(**cache_timeout), \
+                mock.patch.object(SlidingWindowThrottleMixin, 'allow_request', return_value=True):
+            for name, call in endpoints.items():
+                results[name] = self._measure(call, options['requests'], options['warmup'])
+                self._print(name, results[name])
+
+        report = {
+            'label': options['label'],
+            'created_at': timezone.now().isoformat(),
+            'environment': {
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'catalog_cache': options['with_cache'],
+                'requests': options['requests'],
+            },
+            'scale': {
+                model.__name__.lower(): self._rows(model)
+                for model in (User, Course, Module, Lesson, Enrollment)
+            },
+            'endpoints': results,
+        }
+        Path(options['output']).write_text(json.dumps(report, indent=2))
+        self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+        if options['compare']:
+            self._compare(json.loads(Path(options['compare']).read_text()), report)
+
+    def _measure(self, call, requests, warmup):
+        for _ in range(warmup):
+            call()
+        latencies, queries, errors = [], [], 0
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = call()
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+            errors += response.status_code >= 400
+
+        # One extra request under tracemalloc; tracing would skew the timings above.
+        tracemalloc.start()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            'p50_ms': round(cuts[49], 2),
+            'p95_ms': round(cuts[94], 2),
+            'p99_ms': round(cuts[98], 2),
+            'max_ms': round(max(latencies), 2),
+            'queries': round(statistics.mean(queries), 1),
+            'peak_kib': round(peak / 1024, 1),
+            'errors': errors,
+        }
+
+    def _rows(self, model):
+        queryset = model._default_manager.all()
+        estimate = estimate_count(queryset)
+        return estimate if estimate is not None else queryset.count()
+
+    def _print(self, name, result):
+        self.stdout.write(
+            f"{name:>18} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+            f"queries {result['queries']:>5}  peak {result['peak_kib']:>9.1f} KiB  "
+            f"errors {result['errors']}"
+        )
+
+    def _compare(self, before, after):
+        self.stdout.write(f"\nvs {before.get('label') or before['created_at']}:")
+        for name, now in after['endpoints'].items():
+            then = before['endpoints'].get(name)
+            if then is None:
+                continue
+            change = (now['p95_ms'] - then['p95_ms']) / then['p95_ms'] * 100 if then['p95_ms'] else 0
+            self.stdout.write(
+                f"{name:>18} p95 {then['p95_ms']:>8.2f} -> {now['p95_ms']:>8.2f} ms ({change:+.0f}%)  "
+                f"queries {then['queries']} -> {now['queries']}"
+            )
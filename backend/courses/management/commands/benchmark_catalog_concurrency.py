@@ -0,0 +1,106 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+
+from courses.async_views import AsyncCourseDetailView, AsyncCourseListView
+from courses.models import Course
+from courses.views import CourseViewSet
+
+
+class UnthrottledCourseViewSet(CourseViewSet):
+    throttle_classes = ()
+
+
+class UnthrottledAsyncList(AsyncCourseListView):
+    throttle_classes = ()
+
+
+class UnthrottledAsyncDetail(AsyncCourseDetailView):
+    throttle_classes = ()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare concurrent catalog reads: DRF on a threaded WSGI worker, DRF under '
+        'neo_lms.asgi (thread-sensitive executor) and the async-ORM views.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--wsgi-threads', type=int, default=8)
+        parser.add_argument('--endpoint', choices=('list', 'detail'), default='list')
+
+    def handle(self, *args, **options):
+        course = Course.objects.filter(is_published=True).first()
+        if options['endpoint'] == 'detail' and course is None:
+            self.stderr.write('No published course to fetch; seed some data first.')
+            return
+
+        path, kwargs = ('/api/courses/', {})
+        sync_view = UnthrottledCourseViewSet.as_view({'get': 'list'})
+        async_view = UnthrottledAsyncList.as_view()
+        if options['endpoint'] == 'detail':
+            path, kwargs = (f'/api/courses/{course.pk}/', {'pk': course.pk})
+            sync_view = UnthrottledCourseViewSet.as_view({'get': 'retrieve'})
+            async_view = UnthrottledAsyncDetail.as_view()
+
+        total, concurrency = options['requests'], options['concurrency']
+        self.stdout.write(f"{'path':>10} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        # Measure the database path, not the catalog cache.
+        with override_settings(COURSE_CACHE_TIMEOUT=0):
+            self._report('wsgi', self._run_threads(sync_view, path, kwargs, total, options['wsgi_threads']))
+            asgi_sync = sync_to_async(sync_view, thread_sensitive=True)
+            self._report('asgi-sync', asyncio.run(self._run_async(asgi_sync, path, kwargs, total, concurrency)))
+            self._report('asgi-async', asyncio.run(self._run_async(async_view, path, kwargs, total, concurrency)))
+
+    def _run_threads(self, view, path, kwargs, total, threads):
+        factory = RequestFactory()
+
+        def fetch(_):
+            start = time.perf_counter()
+            try:
+                response = view(factory.get(path), **kwargs)
+                response.render()
+                return (time.perf_counter() - start) * 1000, response.status_code
+            finally:
+                close_old_connections()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(fetch, range(total)))
+        return time.perf_counter() - started, results
+
+    async def _run_async(self, view, path, kwargs, total, concurrency):
+        factory = AsyncRequestFactory()
+        gate = asyncio.Semaphore(concurrency)
+        results = []
+
+        async def fetch():
+            # Like ASGIHandler, give each request its own thread-sensitive context.
+            async with gate, ThreadSensitiveContext():
+                start = time.perf_counter()
+                response = await view(factory.get(path), **kwargs)
+                if hasattr(response, 'render'):
+                    await sync_to_async(response.render)()
+                results.append(((time.perf_counter() - start) * 1000, response.status_code))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch() for _ in range(total)))
+        return time.perf_counter() - started, results
+
+    def _report(self, name, result):
+        elapsed, results = result
+        latencies = [latency for latency, _ in results]
+        errors = sum(1 for _, code in results if code != 200)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        self.stdout.write(
+            f'{name:>10} {len(results) / elapsed:>8.1f} {statistics.median(latencies):>8.1f} '
+            f'{p95:>8.1f} {errors:>7}'
+        )
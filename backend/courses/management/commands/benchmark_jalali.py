@@ -0,0 +1,63 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from jdatetime import datetime as jdatetime
+
+from neo_lms.utils.jalali import format_jalali, format_jalali_many, jalali_day
+
+
+def format_jalali_uncached(dt, include_time=True):
+    # The per-cell conversion used before the day cache, kept as the baseline.
+    if not dt:
+        return "-"
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone=timezone.get_default_timezone())
+    local_dt = timezone.localtime(dt)
+    jdt = jdatetime.fromgregorian(datetime=local_dt)
+    fmt = "%Y/%m/%d"
+    if include_time:
+        fmt = f"{fmt} - %H:%M"
+    return jdt.strftime(fmt)
+
+
+class Command(BaseCommand):
+    help = 'Compare per-cell Jalali formatting with the memoized and batch versions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Datetimes per column.')
+        parser.add_argument('--days', type=int, default=30, help='Distinct days they span.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        start = timezone.make_aware(datetime(2025, 3, 1))
+        span = timedelta(days=options['days']).total_seconds()
+        column = [
+            start + timedelta(seconds=rng.uniform(0, span)) for _ in range(options['rows'])
+        ]
+
+        baseline = [format_jalali_uncached(dt) for dt in column]
+        if [format_jalali(dt) for dt in column] != baseline or format_jalali_many(column) != baseline:
+            raise CommandError('Cached formatting differs from the baseline.')
+
+        candidates = (
+            ('per-cell (old)', lambda: [format_jalali_uncached(dt) for dt in column]),
+            ('format_jalali', lambda: [format_jalali(dt) for dt in column]),
+            ('format_jalali_many', lambda: format_jalali_many(column)),
+        )
+        self.stdout.write(f"{'variant':>20} {'best ms':>9} {'us/row':>8}")
+        for name, run in candidates:
+            timings = []
+            for _ in range(options['repeat']):
+                jalali_day.cache_clear()
+                began = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - began)
+            best = min(timings)
+            self.stdout.write(
+                f'{name:>20} {best * 1000:>9.2f} {best / len(column) * 1e6:>8.2f}'
+            )
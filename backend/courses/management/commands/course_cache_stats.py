@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from courses import cache as course_cache
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the course catalog cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after printing them.',
+        )
+
+    def handle(self, *args, **options):
+        stats = course_cache.stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}"
+        )
+        if options['reset']:
+            course_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from courses import search as course_search
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored full-text search vector of every course.'
+
+    def handle(self, *args, **options):
+        count = course_search.update_search_vectors()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search vectors for {count} course(s).'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses import stats as course_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized Course counters, or check them with --check.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report courses whose counters are out of date.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of courses updated per statement.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            stale = list(course_stats.find_inconsistent().values_list('pk', 'title'))
+            for pk, title in stale:
+                self.stdout.write(f'{pk}\t{title}')
+            if stale:
+                raise CommandError(f'{len(stale)} course(s) have inconsistent counters.')
+            self.stdout.write(self.style.SUCCESS('All course counters are consistent.'))
+            return
+
+        count = course_stats.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt counters for {count} course(s).'))
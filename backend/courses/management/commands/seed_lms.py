@@ -0,0 +1,228 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from courses import cache as course_cache
+from courses import search as course_search
+from courses import stats as course_stats
+from courses.models import Course, Enrollment, Lesson, Module
+from courses.outline import ORDER_GAP
+
+User = get_user_model()
+
+PREFIX = 'seed_'
+SCALES = {
+    # instructors, students, courses, modules per course, lessons per module, enrollments
+    'small': (10, 1_000, 50, 4, 5, 10_000),
+    'medium': (50, 50_000, 500, 5, 8, 500_000),
+    'large': (200, 500_000, 2_000, 6, 10, 5_000_000),
+}
+WORDS = (
+    'python', 'django', 'data', 'design', 'web', 'react', 'security', 'cloud',
+    'mobile', 'machine', 'learning', 'database', 'testing', 'devops', 'linux',
+    'برنامه‌نویسی', 'طراحی', 'شبکه', 'هوش', 'مصنوعی', 'پایگاه', 'داده',
+)
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def _manual_timestamps(*fields):
+    # Let bulk_create keep the spread-out dates we generate.
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a reproducible data set (users, courses, modules, lessons and '
+        'enrollments) with bulk_create. Seeded users are prefixed "seed_".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small')
+        parser.add_argument('--instructors', type=int)
+        parser.add_argument('--students', type=int)
+        parser.add_argument('--courses', type=int)
+        parser.add_argument('--modules', type=int, help='Modules per course.')
+        parser.add_argument('--lessons', type=int, help='Lessons per module.')
+        parser.add_argument('--enrollments', type=int)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='seed-pass', help='Password of every seeded user.')
+        parser.add_argument('--flush', action='store_true', help='Delete previously seeded data first.')
+
+    def handle(self, *args, **options):
+        defaults = dict(zip(
+            ('instructors', 'students', 'courses', 'modules', 'lessons', 'enrollments'),
+            SCALES[options['scale']],
+        ))
+        sizes = {name: options[name] if options[name] is not None else value
+                 for name, value in defaults.items()}
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+
+        if options['flush']:
+            self._flush()
+
+        # Hash once; PBKDF2 per user would dominate the run.
+        password = make_password(options['password'])
+        with transaction.atomic():
+            instructors = self._users('instructor', sizes['instructors'], User.Roles.INSTRUCTOR, password)
+            students = self._users('student', sizes['students'], User.Roles.STUDENT, password)
+            self._admin(password)
+            courses = self._courses(instructors, sizes['courses'])
+            modules = self._modules(courses, sizes['modules'])
+            lessons = self._lessons(modules, sizes['lessons'])
+            enrollments = self._enrollments(students, courses, sizes['enrollments'])
+
+            # bulk_create skips the signals that keep these up to date.
+            course_stats.rebuild(Course.objects.filter(pk__in=courses))
+            course_search.update_search_vectors(courses)
+        course_cache.invalidate_course(None)
+
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(instructors)} instructors, {len(students)} students, '
+            f'{len(courses)} courses, {len(modules)} modules, {lessons} lessons, '
+            f'{enrollments} enrollments.'
+        ))
+
+    def _flush(self):
+        # The big leaf tables go with a plain DELETE; the ORM cascade would
+        # load every row to fire per-row signals.
+        seeded = Q(user__username__startswith=PREFIX) | Q(course__slug__startswith='seed-course-')
+        with transaction.atomic():
+            enrollments = Enrollment.objects.filter(seeded)._raw_delete(Enrollment.objects.db)
+            lessons = Lesson.objects.filter(module__course__slug__startswith='seed-course-')
+            lessons = lessons._raw_delete(Lesson.objects.db)
+            users, _ = User.objects.filter(username__startswith=PREFIX).delete()
+        self.stdout.write(f'Flushed {enrollments} enrollments, {lessons} lessons, {users} other rows.')
+
+    def _past(self, days):
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def _users(self, kind, count, role, password):
+        start = User.objects.filter(username__startswith=f'{PREFIX}{kind}').count()
+        rows = (
+            User(
+                username=f'{PREFIX}{kind}{n}',
+                email=f'{PREFIX}{kind}{n}@example.com',
+                password=password,
+                role=role,
+                date_joined=self._past(730),
+            )
+            for n in range(start, start + count)
+        )
+        ids = []
+        for batch in _batched(rows, self.batch_size):
+            ids.extend(user.pk for user in User.objects.bulk_create(batch))
+        return ids
+
+    def _admin(self, password):
+        User.objects.get_or_create(
+            username=f'{PREFIX}admin',
+            defaults={
+                'email': f'{PREFIX}admin@example.com',
+                'password': password,
+                'role': User.Roles.ADMIN,
+                'is_staff': True,
+                'is_superuser': True,
+            },
+        )
+
+    def _courses(self, instructors, count):
+        start = Course.objects.filter(slug__startswith='seed-course-').count()
+        rows = []
+        for n in range(start, start + count):
+            created = self._past(730)
+            title = ' '.join(self.rng.sample(WORDS, 3)).title()
+            rows.append(Course(
+                title=title,
+                slug=f'seed-course-{n}',
+                description=' '.join(self.rng.choices(WORDS, k=40)),
+                price=self.rng.choice((0, 0, 190000, 490000, 990000)),
+                image='course_images/seed.png',
+                instructor_id=self.rng.choice(instructors),
+                is_published=self.rng.random() < 0.9,
+                created_at=created,
+                updated_at=created,
+            ))
+        fields = (Course._meta.get_field('created_at'), Course._meta.get_field('updated_at'))
+        with _manual_timestamps(*fields):
+            return [course.pk for batch in _batched(rows, self.batch_size)
+                    for course in Course.objects.bulk_create(batch)]
+
+    def _modules(self, courses, per_course):
+        rows = (
+            Module(course_id=course_id, title=f'Module {order + 1}', order=(order + 1) * ORDER_GAP)
+            for course_id in courses
+            for order in range(per_course)
+        )
+        return [module.pk for batch in _batched(rows, self.batch_size)
+                for module in Module.objects.bulk_create(batch)]
+
+    def _lessons(self, modules, per_module):
+        rows = (
+            Lesson(
+                module_id=module_id,
+                title=' '.join(self.rng.sample(WORDS, 2)),
+                content=' '.join(self.rng.choices(WORDS, k=self.rng.randint(100, 1500))),
+                video_url=f'https://videos.example.com/{module_id}/{order}.mp4',
+                duration=timedelta(minutes=self.rng.randint(3, 45)),
+                is_free=order == 0,
+                order=(order + 1) * ORDER_GAP,
+            )
+            for module_id in modules
+            for order in range(per_module)
+        )
+        created = 0
+        for batch in _batched(rows, self.batch_size):
+            created += len(Lesson.objects.bulk_create(batch))
+        return created
+
+    def _enrollments(self, students, courses, count):
+        if not students or not courses:
+            return 0
+        students = students[:count]
+        # Popularity follows a power law, like real catalogs.
+        cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(courses))))
+        per_student = max(1, min(len(courses), count // len(students)))
+        remainder = max(0, count - per_student * len(students))
+
+        def rows():
+            for index, user_id in enumerate(students):
+                k = per_student + (1 if index < remainder else 0)
+                picked = set()
+                while len(picked) < min(k, len(courses)):
+                    picked.update(self.rng.choices(courses, cum_weights=cum_weights, k=k - len(picked)))
+                for course_id in picked:
+                    yield Enrollment(user_id=user_id, course_id=course_id, enrolled_at=self._past(365))
+
+        created = 0
+        with _manual_timestamps(Enrollment._meta.get_field('enrolled_at')):
+            for batch in _batched(rows(), self.batch_size):
+                Enrollment.objects.bulk_create(batch, ignore_conflicts=True)
+                created += len(batch)
+        return created
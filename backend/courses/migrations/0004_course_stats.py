@@ -0,0 +1,61 @@
+import datetime
+from django.db import migrations, models
+from django.db.models import Count, DurationField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_course_stats(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Module = apps.get_model('courses', 'Module')
+    Lesson = apps.get_model('courses', 'Lesson')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+
+    def subquery(model, group_field, aggregate, output_field, empty):
+        values = (
+            model.objects.filter(**{group_field: OuterRef('pk')})
+            .order_by()
+            .values(group_field)
+            .annotate(value=aggregate)
+            .values('value')
+        )
+        return Coalesce(Subquery(values, output_field=output_field), Value(empty), output_field=output_field)
+
+    Course.objects.update(
+        module_count=subquery(Module, 'course', Count('pk'), IntegerField(), 0),
+        lesson_count=subquery(Lesson, 'module__course', Count('pk'), IntegerField(), 0),
+        total_duration=subquery(
+            Lesson, 'module__course', Sum('duration'), DurationField(), datetime.timedelta(0)
+        ),
+        enrollment_count=subquery(Enrollment, 'course', Count('pk'), IntegerField(), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_module_lesson_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='module_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_duration',
+            field=models.DurationField(default=datetime.timedelta(0), editable=False),
+        ),
+        migrations.RunPython(populate_course_stats, migrations.RunPython.noop),
+    ]
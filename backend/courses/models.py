@@ -1,7 +1,36 @@
+from datetime import timedelta
+
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
+class CourseQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """
+        Courses ``user`` may see: admins all, instructors published plus their
+        own, everyone else published only.
+        """
+        Roles = get_user_model().Roles
+        role = getattr(user, 'role', None) if user and user.is_authenticated else None
+        if role == Roles.ADMIN:
+            return self
+        if role == Roles.INSTRUCTOR:
+            return self.filter(models.Q(is_published=True) | models.Q(instructor_id=user.pk))
+        return self.filter(is_published=True)
+
+    def with_outline(self):
+        """
+        Prefetch modules and lessons without reading lesson bodies or videos.
+        """
+        return self.prefetch_related(
+            'modules',
+            models.Prefetch('modules__lessons', queryset=Lesson.objects.defer('content', 'video_url')),
+        )
+
+
 class Course(models.Model):
     title = models.CharField(max_length=255)
     slug = models.SlugField(unique=True)
@@ -17,8 +46,27 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized counters, maintained by courses.stats.
+    module_count = models.PositiveIntegerField(default=0, editable=False)
+    lesson_count = models.PositiveIntegerField(default=0, editable=False)
+    total_duration = models.DurationField(default=timedelta(0), editable=False)
+    enrollment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Full-text document over the course and its lessons, see courses.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Resized copies of ``image`` keyed by variant name, see courses.images.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = CourseQuerySet.as_manager()
+
     class Meta:
         ordering = ('-created_at',)
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='course_created_id_idx'),
+            GinIndex(fields=['search_vector'], name='course_search_vector_idx'),
+            GinIndex(fields=['title'], name='course_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -36,9 +84,13 @@ class Module(models.Model):
     )
     title = models.CharField(max_length=255)
     order = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ('order',)
+        indexes = [
+            models.Index(fields=['course', 'order'], name='module_course_order_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.course.title} - {self.title}'
@@ -56,9 +108,13 @@ class Lesson(models.Model):
     duration = models.DurationField()
     is_free = models.BooleanField(default=False)
     order = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ('order',)
+        indexes = [
+            models.Index(fields=['module', 'order'], name='lesson_module_order_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.module.title} - {self.title}'
@@ -77,9 +133,49 @@ class Enrollment(models.Model):
     )
     enrolled_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized from LessonProgress by courses.progress.
+    progress_seconds = models.PositiveIntegerField(default=0, editable=False)
+    completed_lessons = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         unique_together = ('user', 'course')
         ordering = ('-enrolled_at',)
+        indexes = [
+            models.Index(fields=['-enrolled_at', 'id'], name='enrollment_enrolled_id_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.user} -> {self.course}'
+
+
+class LessonProgress(models.Model):
+    """
+    Furthest point a user reached in a lesson, upserted in batches from
+    player heartbeats by courses.progress.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='lesson_progress',
+    )
+    lesson = models.ForeignKey(
+        Lesson,
+        on_delete=models.CASCADE,
+        related_name='progress',
+    )
+    # Seconds; never move backwards.
+    position = models.PositiveIntegerField(default=0)
+    # Seconds counted toward the course: the lesson duration once completed,
+    # otherwise the position capped at it.
+    credited = models.PositiveIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'lesson'], name='lesson_progress_user_lesson_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id} @ {self.lesson_id}: {self.position}s'
@@ -0,0 +1,215 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from . import cache as course_cache
+from . import search as course_search
+from . import stats as course_stats
+from .models import Course, Enrollment, Lesson, LessonProgress, Module
+from .progress import enrollment_totals
+
+# Distance between the order keys of freshly numbered siblings: ten inserts
+# at the same spot fit before the siblings have to be renumbered.
+ORDER_GAP = 1024
+
+MODULE_FIELDS = ('title',)
+LESSON_FIELDS = ('title', 'content', 'video_url', 'duration', 'is_free')
+# Fields the search document is built from.
+SEARCH_FIELDS = {'title', 'content'}
+
+
+def _ascending_run(keys):
+    """
+    Indexes of a longest strictly ascending subsequence of the non-None keys.
+    """
+    tails, tail_indexes = [], []
+    previous = [None] * len(keys)
+    for index, key in enumerate(keys):
+        if key is None:
+            continue
+        position = bisect_left(tails, key)
+        if position:
+            previous[index] = tail_indexes[position - 1]
+        if position == len(tails):
+            tails.append(key)
+            tail_indexes.append(index)
+        else:
+            tails[position] = key
+            tail_indexes[position] = index
+    run = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        run.add(index)
+        index = previous[index]
+    return run
+
+
+def _spread(low, high, count):
+    """
+    ``count`` ascending integers strictly between ``low`` and ``high`` (either
+    may be None for an open end), or None when they do not fit.
+    """
+    if high is None:
+        high = (low if low is not None else 0) + ORDER_GAP * (count + 1)
+    if low is None:
+        low = max(-1, high - ORDER_GAP * (count + 1))
+    step = (high - low) / (count + 1)
+    if step < 1:
+        return None
+    return [low + int(step * (n + 1)) for n in range(count)]
+
+
+def order_keys(current):
+    """
+    Order keys for siblings in their new sequence, given each one's current
+    key (None for new or moved-in items).
+
+    Items on the longest run that is already ascending keep their keys; the
+    others get keys spaced inside the gaps around them, so moving one item
+    rewrites one row. If a gap is too narrow, all siblings are renumbered
+    ``ORDER_GAP`` apart.
+    """
+    run = _ascending_run(current)
+    keys = list(current)
+    index = 0
+    while index < len(keys):
+        if index in run:
+            index += 1
+            continue
+        end = index
+        while end < len(keys) and end not in run:
+            end += 1
+        low = keys[index - 1] if index else None
+        high = keys[end] if end < len(keys) else None
+        spread = _spread(low, high, end - index)
+        if spread is None:
+            return [ORDER_GAP * (n + 1) for n in range(len(keys))]
+        keys[index:end] = spread
+        index = end
+    return keys
+
+
+def _assign(obj, values):
+    """
+    Set the differing ``values`` on ``obj``; return the changed field names.
+    """
+    deferred = obj.get_deferred_fields()
+    changed = []
+    for name, value in values.items():
+        attname = obj._meta.get_field(name).attname
+        # Deferred columns (lesson bodies) are written without being read first.
+        if attname in deferred or getattr(obj, attname) != value:
+            setattr(obj, attname, value)
+            changed.append(name)
+    return tuple(changed)
+
+
+def _check_ids(outline, modules, lessons):
+    module_ids = [data['id'] for data in outline if 'id' in data]
+    lesson_ids = [item['id'] for data in outline for item in data['lessons'] if 'id' in item]
+    if not set(module_ids) <= modules.keys() or not set(lesson_ids) <= lessons.keys():
+        raise ValidationError({'modules': 'شناسهٔ فصل یا درس به این دوره تعلق ندارد.'})
+    if len(set(module_ids)) != len(module_ids) or len(set(lesson_ids)) != len(lesson_ids):
+        raise ValidationError({'modules': 'هر فصل یا درس فقط یک بار می‌تواند در ساختار بیاید.'})
+
+
+def apply_outline(course, outline):
+    """
+    Make the modules and lessons of ``course`` match ``outline``, a list of
+    modules (``id`` to keep one, none to create it) each with its ``lessons``.
+
+    Listed order is the new order, lessons may move between modules and
+    anything left out is deleted. Changed rows are written with one
+    ``bulk_create``/``bulk_update`` per model and field set; as these skip
+    the model signals, counters, search document and cache are refreshed
+    here. Returns ``{'created': n, 'updated': n, 'deleted': n}``.
+    """
+    now = timezone.now()
+    summary = {'created': 0, 'updated': 0, 'deleted': 0}
+    with transaction.atomic():
+        # Serialize concurrent edits of the same course.
+        list(Course.objects.select_for_update().filter(pk=course.pk).order_by().values_list('pk'))
+        modules = {module.pk: module for module in Module.objects.filter(course=course)}
+        lessons = {
+            lesson.pk: lesson
+            for lesson in Lesson.objects.filter(module__course=course).defer('content')
+        }
+        _check_ids(outline, modules, lessons)
+
+        placed_modules, new_modules = [], []
+        updates = defaultdict(list)
+        current = [modules[data['id']].order if 'id' in data else None for data in outline]
+        for data, key in zip(outline, order_keys(current)):
+            values = {'order': key, **{name: data[name] for name in MODULE_FIELDS if name in data}}
+            if 'id' in data:
+                module = modules[data['id']]
+                changed = _assign(module, values)
+                if changed:
+                    module.updated_at = now
+                    updates[Module, changed + ('updated_at',)].append(module)
+            else:
+                module = Module(course=course, **values)
+                new_modules.append(module)
+            placed_modules.append(module)
+        Module.objects.bulk_create(new_modules)
+
+        placed_lessons, new_lessons = set(), []
+        search_changed = False
+        duration_changed = False
+        for module, data in zip(placed_modules, outline):
+            items = data['lessons']
+            current = []
+            for item in items:
+                lesson = lessons.get(item.get('id'))
+                current.append(lesson.order if lesson and lesson.module_id == module.pk else None)
+            for item, key in zip(items, order_keys(current)):
+                values = {
+                    'module': module.pk,
+                    'order': key,
+                    **{name: item[name] for name in LESSON_FIELDS if name in item},
+                }
+                if 'id' in item:
+                    lesson = lessons[item['id']]
+                    placed_lessons.add(lesson.pk)
+                    changed = _assign(lesson, values)
+                    if changed:
+                        lesson.updated_at = now
+                        updates[Lesson, changed + ('updated_at',)].append(lesson)
+                        search_changed |= bool(SEARCH_FIELDS.intersection(changed))
+                        duration_changed |= 'duration' in changed
+                else:
+                    values['module'] = module
+                    new_lessons.append(Lesson(**values))
+        Lesson.objects.bulk_create(new_lessons)
+        search_changed |= bool(new_lessons)
+
+        for (model, fields), objs in updates.items():
+            model.objects.bulk_update(objs, fields)
+            summary['updated'] += len(objs)
+        summary['created'] = len(new_modules) + len(new_lessons)
+
+        removed_lessons = lessons.keys() - placed_lessons
+        removed_modules = modules.keys() - {module.pk for module in placed_modules}
+        progress_removed = 0
+        if removed_lessons:
+            progress_removed, _ = LessonProgress.objects.filter(lesson_id__in=removed_lessons).delete()
+            # Dependent progress rows are gone and every lesson of a removed
+            # module is either removed or moved, so no cascade is needed.
+            Lesson.objects.filter(pk__in=removed_lessons)._raw_delete(Lesson.objects.db)
+        if removed_modules:
+            Module.objects.filter(pk__in=removed_modules)._raw_delete(Module.objects.db)
+        summary['deleted'] = len(removed_lessons) + len(removed_modules)
+        search_changed |= bool(summary['deleted'])
+
+        if summary['created'] or summary['deleted'] or duration_changed:
+            Course.objects.filter(pk=course.pk).update(**course_stats.computed_stats())
+        if progress_removed:
+            Enrollment.objects.filter(course=course).update(**enrollment_totals())
+        if search_changed:
+            transaction.on_commit(lambda: course_search.update_search_vectors([course.pk]))
+        if summary['created'] or summary['updated'] or summary['deleted']:
+            transaction.on_commit(lambda: course_cache.invalidate_course(course.pk))
+    return summary
@@ -0,0 +1,67 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class CourseCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the catalog, matching Course.Meta.ordering.
+    """
+
+    ordering = ('-created_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CourseSearchPagination(PageNumberPagination):
+    """
+    Page-number pagination for ranked ``?q=`` results.
+    """
+
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class EnrollmentCursorPagination(CursorPagination):
+    """
+    Keyset pagination over enrollments, matching Enrollment.Meta.ordering.
+    """
+
+    ordering = ('-enrolled_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CourseKeyset:
+    """
+    Opaque (created_at, id) cursor used by the async catalog view.
+
+    Unlike CursorPagination, the position includes the id, so ties on
+    created_at never fall back to an OFFSET.
+    """
+
+    ordering = ('-created_at', 'id')
+
+    @staticmethod
+    def encode(course) -> str:
+        raw = f'{course.created_at.isoformat()}|{course.pk}'
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode(cursor: str):
+        try:
+            created_at, pk = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, UnicodeError, binascii.Error) as exc:
+            raise ValueError('invalid cursor') from exc
+
+    @staticmethod
+    def after(position):
+        created_at, pk = position
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__gt=pk)
@@ -0,0 +1,22 @@
+from rest_framework.permissions import BasePermission
+
+from .models import Enrollment
+
+
+class HasLessonAccess(BasePermission):
+    """
+    Free lessons are open; others need enrollment, course ownership or role='admin'.
+    """
+
+    message = 'برای مشاهده این درس باید در دوره ثبت‌نام کنید.'
+
+    def has_object_permission(self, request, view, lesson):
+        if lesson.is_free:
+            return True
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+        course = lesson.module.course
+        if getattr(user, 'role', None) == user.Roles.ADMIN or course.instructor_id == user.pk:
+            return True
+        return Enrollment.objects.filter(user_id=user.pk, course_id=course.pk).exists()
@@ -0,0 +1,159 @@
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from neo_lms.utils import buffers
+
+from .models import Enrollment, Lesson, LessonProgress
+
+UPSERT_FIELDS = ('user', 'lesson', 'position', 'credited', 'completed', 'updated_at')
+
+
+def merge(previous, beat):
+    """
+    Combine two ``(position, completed)`` heartbeats of one (user, lesson):
+    furthest position, and completed once either says so.
+    """
+    if previous is None:
+        return beat
+    return max(previous[0], beat[0]), previous[1] or beat[1]
+
+
+def _upsert_sql(count):
+    """
+    Multi-row INSERT that merges into existing rows the same way as ``merge``,
+    so concurrent flushes from several processes cannot undo each other.
+    """
+    meta = LessonProgress._meta
+    qn = connection.ops.quote_name
+    table = qn(meta.db_table)
+    columns = {name: qn(meta.get_field(name).column) for name in UPSERT_FIELDS}
+    greatest = 'GREATEST' if connection.vendor == 'postgresql' else 'MAX'
+    placeholders = ', '.join(['(' + ', '.join(['%s'] * len(UPSERT_FIELDS)) + ')'] * count)
+    return (
+        f'INSERT INTO {table} ({", ".join(columns.values())}) VALUES {placeholders} '
+        f'ON CONFLICT ({columns["user"]}, {columns["lesson"]}) DO UPDATE SET '
+        f'{columns["position"]} = {greatest}({table}.{columns["position"]}, EXCLUDED.{columns["position"]}), '
+        f'{columns["credited"]} = {greatest}({table}.{columns["credited"]}, EXCLUDED.{columns["credited"]}), '
+        f'{columns["completed"]} = {table}.{columns["completed"]} OR EXCLUDED.{columns["completed"]}, '
+        f'{columns["updated_at"]} = EXCLUDED.{columns["updated_at"]}'
+    )
+
+
+def enrollment_totals():
+    """
+    UPDATE expressions recomputing an enrollment's progress from its own rows.
+    """
+    progress = (
+        LessonProgress.objects.filter(
+            user_id=OuterRef('user_id'), lesson__module__course_id=OuterRef('course_id')
+        )
+        .order_by()
+        .values('user_id')
+    )
+
+    def total(aggregate):
+        values = progress.annotate(value=aggregate).values('value')
+        return Coalesce(Subquery(values, output_field=IntegerField()), Value(0))
+
+    return {
+        'progress_seconds': total(Sum('credited')),
+        'completed_lessons': total(Count('pk', filter=Q(completed=True))),
+    }
+
+
+def write(events):
+    """
+    Store coalesced heartbeats ``{(user_id, lesson_id): (position, completed)}``.
+
+    Heartbeats for lessons of courses the user is not enrolled in are dropped.
+    Costs two lookups, one upsert per batch and one UPDATE of the touched
+    enrollments' totals, however many events there are.
+    """
+    if not events:
+        return 0
+    lessons = {
+        pk: (course_id, int(duration.total_seconds()))
+        for pk, course_id, duration in Lesson.objects.filter(
+            pk__in={lesson_id for _, lesson_id in events}
+        ).order_by().values_list('pk', 'module__course_id', 'duration')
+    }
+    enrollments = {
+        (user_id, course_id): pk
+        for pk, user_id, course_id in Enrollment.objects.filter(
+            user_id__in={user_id for user_id, _ in events},
+            course_id__in={course_id for course_id, _ in lessons.values()},
+        ).order_by().values_list('pk', 'user_id', 'course_id')
+    }
+
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    rows = []
+    touched = set()
+    for (user_id, lesson_id), (position, completed) in events.items():
+        if lesson_id not in lessons:
+            continue
+        course_id, duration = lessons[lesson_id]
+        enrollment_id = enrollments.get((user_id, course_id))
+        if enrollment_id is None:
+            continue
+        credited = duration if completed else min(position, duration)
+        rows.append((user_id, lesson_id, position, credited, completed, now))
+        touched.add(enrollment_id)
+    if not rows:
+        return 0
+
+    fields = [LessonProgress._meta.get_field(name) for name in UPSERT_FIELDS]
+    batch_size = max(1, connection.ops.bulk_batch_size(fields, rows))
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            cursor.execute(_upsert_sql(len(batch)), [value for row in batch for value in row])
+        Enrollment.objects.filter(pk__in=touched).update(**enrollment_totals())
+    return len(rows)
+
+
+def heartbeat_buffer(interval, max_size):
+    """
+    Per-process buffer of player heartbeats, coalesced per (user, lesson)
+    and written every ``interval`` seconds, or as soon as ``max_size``
+    pairs are pending, once started.
+    """
+    return buffers.CoalescingBuffer('progress-flush', write, merge, interval, max_size)
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = buffers.register(
+                    heartbeat_buffer(settings.PROGRESS_FLUSH_INTERVAL, settings.PROGRESS_FLUSH_SIZE)
+                )
+    return _buffer
+
+
+def record(user_id, heartbeats):
+    """
+    Accept ``(lesson_id, position, completed)`` heartbeats from one user.
+
+    With PROGRESS_FLUSH_INTERVAL at 0 they are written immediately instead
+    of buffered (tests, single-user development).
+    """
+    if settings.PROGRESS_FLUSH_INTERVAL <= 0:
+        events = {}
+        for lesson_id, position, completed in heartbeats:
+            key = (user_id, lesson_id)
+            events[key] = merge(events.get(key), (position, completed))
+        return write(events)
+    buffer = get_buffer()
+    for lesson_id, position, completed in heartbeats:
+        buffer.add((user_id, lesson_id), (position, completed))
+    return 0
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db.models import F, OuterRef, Q, Subquery, TextField
+
+from .models import Course, Lesson
+
+
+def _lesson_text(weight_field):
+    return Subquery(
+        Lesson.objects.filter(module__course=OuterRef('pk'))
+        .order_by()
+        .values('module__course')
+        .annotate(text=StringAgg(weight_field, delimiter=' '))
+        .values('text'),
+        output_field=TextField(),
+    )
+
+
+def search_vector():
+    """
+    Weighted document: course title (A), description and lesson titles (B),
+    lesson bodies (C).
+    """
+    config = settings.COURSE_SEARCH_CONFIG
+    return (
+        SearchVector('title', weight='A', config=config)
+        + SearchVector('description', weight='B', config=config)
+        + SearchVector(_lesson_text('title'), weight='B', config=config)
+        + SearchVector(_lesson_text('content'), weight='C', config=config)
+    )
+
+
+def update_search_vectors(course_ids=None):
+    """
+    Recompute the stored vector of the given courses (all courses when None).
+    """
+    queryset = Course.objects.all()
+    if course_ids is not None:
+        queryset = queryset.filter(pk__in=[pk for pk in course_ids if pk is not None])
+    return queryset.update(search_vector=search_vector())
+
+
+def search(queryset, text: str):
+    """
+    Filter and rank ``queryset`` by full-text match, falling back to trigram
+    similarity on the title for typos and unstemmed (e.g. Persian) words.
+    """
+    query = SearchQuery(text, config=settings.COURSE_SEARCH_CONFIG, search_type='websearch')
+    return (
+        queryset.annotate(
+            rank=SearchRank(F('search_vector'), query),
+            similarity=TrigramSimilarity('title', text),
+        )
+        .filter(Q(search_vector=query) | Q(title__trigram_similar=text))
+        .order_by('-rank', '-similarity', '-created_at', 'id')
+    )
@@ -1,10 +1,29 @@
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
-from .models import Course, Enrollment, Lesson, Module
+from neo_lms.utils.serializers import JalaliFieldsMixin
+
+from .models import Course, Enrollment, Lesson, LessonProgress, Module
 
 
 class LessonSerializer(serializers.ModelSerializer):
+    """
+    Lesson outline; the body and video come from LessonContentSerializer.
+    """
+
+    class Meta:
+        model = Lesson
+        fields = (
+            'id',
+            'title',
+            'duration',
+            'is_free',
+            'order',
+        )
+
+
+class LessonContentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lesson
         fields = (
@@ -31,13 +50,28 @@ class ModuleSerializer(serializers.ModelSerializer):
         )
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Turns the stored ``{variant: name}`` mapping into URLs; empty until generated.
+    """
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        urls = {}
+        for variant, name in (value or {}).items():
+            url = default_storage.url(name)
+            urls[variant] = request.build_absolute_uri(url) if request is not None else url
+        return urls
+
+
+class CourseSerializer(JalaliFieldsMixin, serializers.ModelSerializer):
     modules = ModuleSerializer(many=True, read_only=True)
     instructor = serializers.PrimaryKeyRelatedField(
         queryset=get_user_model().objects.all()
     )
     instructor_name = serializers.SerializerMethodField()
     is_free = serializers.BooleanField(read_only=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Course
@@ -49,6 +83,7 @@ class CourseSerializer(serializers.ModelSerializer):
             'price',
             'is_free',
             'image',
+            'image_variants',
             'instructor',
             'instructor_name',
             'is_published',
@@ -57,14 +92,157 @@ class CourseSerializer(serializers.ModelSerializer):
             'modules',
         )
         read_only_fields = ('created_at', 'updated_at')
+        jalali_fields = ('created_at', 'updated_at')
 
     def get_instructor_name(self, obj):
         return str(obj.instructor)
 
 
+class CourseSummarySerializer(JalaliFieldsMixin, serializers.ModelSerializer):
+    """
+    Flat catalog representation used by the list action (no module/lesson tree).
+    """
+
+    instructor_name = serializers.SerializerMethodField()
+    is_free = serializers.BooleanField(read_only=True)
+    image_variants = ImageVariantsField()
+
+    class Meta:
+        model = Course
+        fields = (
+            'id',
+            'title',
+            'slug',
+            'description',
+            'price',
+            'is_free',
+            'image',
+            'image_variants',
+            'instructor',
+            'instructor_name',
+            'is_published',
+            'created_at',
+            'updated_at',
+            'module_count',
+            'lesson_count',
+            'total_duration',
+        )
+        read_only_fields = fields
+        jalali_fields = ('created_at', 'updated_at')
+
+    def get_instructor_name(self, obj):
+        return str(obj.instructor)
+
+
+class CourseStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Course
+        fields = (
+            'id',
+            'title',
+            'slug',
+            'is_published',
+            'module_count',
+            'lesson_count',
+            'total_duration',
+            'enrollment_count',
+        )
+        read_only_fields = fields
+
+
 class EnrollmentSerializer(serializers.ModelSerializer):
     course = CourseSerializer(read_only=True)
 
     class Meta:
         model = Enrollment
         fields = ('id', 'course', 'enrolled_at')
+
+
+class MyEnrollmentSerializer(JalaliFieldsMixin, serializers.ModelSerializer):
+    """
+    "My learning" row: the course summary without the module/lesson tree.
+    """
+
+    course = CourseSummarySerializer(read_only=True)
+    progress_percent = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Enrollment
+        fields = ('id', 'course', 'enrolled_at', 'completed_lessons', 'progress_percent')
+        jalali_fields = ('enrolled_at',)
+
+    def get_progress_percent(self, obj):
+        # Share of the course's total lesson duration watched or completed.
+        total = obj.course.total_duration.total_seconds()
+        if not total:
+            return 0
+        return min(100.0, round(100 * obj.progress_seconds / total, 1))
+
+
+class HeartbeatSerializer(serializers.Serializer):
+    lesson = serializers.IntegerField(min_value=1)
+    # Player position in seconds; fractions are dropped.
+    position = serializers.FloatField(min_value=0, max_value=10 ** 6)
+    completed = serializers.BooleanField(default=False)
+
+
+class LessonProgressSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LessonProgress
+        fields = ('lesson', 'position', 'completed', 'updated_at')
+        read_only_fields = fields
+
+
+class OutlineLessonSerializer(serializers.Serializer):
+    """
+    A lesson in a course outline: ``id`` keeps an existing lesson, whose
+    other fields are optional changes; without it a lesson is created.
+    """
+
+    id = serializers.IntegerField(min_value=1, required=False)
+    title = serializers.CharField(max_length=255, required=False)
+    content = serializers.CharField(required=False)
+    video_url = serializers.URLField(required=False)
+    duration = serializers.DurationField(required=False)
+    is_free = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if 'id' not in attrs:
+            missing = [name for name in ('title', 'content', 'video_url', 'duration') if name not in attrs]
+            if missing:
+                raise serializers.ValidationError({name: 'برای درس جدید الزامی است.' for name in missing})
+        return attrs
+
+
+class OutlineModuleSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1, required=False)
+    title = serializers.CharField(max_length=255, required=False)
+    lessons = OutlineLessonSerializer(many=True)
+
+    def validate(self, attrs):
+        if 'id' not in attrs and 'title' not in attrs:
+            raise serializers.ValidationError({'title': 'برای فصل جدید الزامی است.'})
+        return attrs
+
+
+class CourseOutlineSerializer(serializers.Serializer):
+    """
+    The whole module/lesson structure of a course, in order (courses.outline).
+    """
+
+    modules = OutlineModuleSerializer(many=True, max_length=500)
+
+
+class EnrollmentCreateSerializer(serializers.Serializer):
+    course = serializers.PrimaryKeyRelatedField(
+        queryset=Course.objects.filter(is_published=True)
+    )
+
+
+class BulkEnrollmentSerializer(serializers.Serializer):
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    users = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=50000,
+    )
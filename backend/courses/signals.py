@@ -0,0 +1,189 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache as course_cache
+from . import search as course_search
+from . import stats as course_stats
+from . import tasks as course_tasks
+from .models import Course, Enrollment, Lesson, Module
+
+
+def _invalidate_on_commit(course_id):
+    transaction.on_commit(lambda: course_cache.invalidate_course(course_id))
+
+
+def _lesson_course_id(lesson):
+    try:
+        return lesson.module.course_id
+    except Module.DoesNotExist:
+        # Cascading delete of the parent module; its own signal covers the course.
+        return None
+
+
+def _moved_from(instance, signal, course_id):
+    """
+    Course a module or lesson was just saved away from, or None if it stayed.
+
+    Uses the ``_stats_previous`` bookkeeping of the pre_save handlers below.
+    """
+    previous = getattr(instance, '_stats_previous', None) if signal is post_save else None
+    if isinstance(instance, Lesson) and previous is not None:
+        previous = previous[0]
+    return previous if previous != course_id else None
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_cache(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def invalidate_module_cache(sender, instance, signal, **kwargs):
+    _invalidate_on_commit(instance.course_id)
+    previous = _moved_from(instance, signal, instance.course_id)
+    if previous is not None:
+        _invalidate_on_commit(previous)
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def invalidate_lesson_cache(sender, instance, signal, **kwargs):
+    course_id = _lesson_course_id(instance)
+    _invalidate_on_commit(course_id)
+    previous = _moved_from(instance, signal, course_id)
+    if previous is not None:
+        _invalidate_on_commit(previous)
+
+
+# --- Denormalized course counters -----------------------------------------
+
+@receiver(pre_save, sender=Module)
+def remember_module_course(sender, instance, raw=False, **kwargs):
+    instance._stats_previous = None
+    if instance.pk and not raw:
+        instance._stats_previous = (
+            Module.objects.filter(pk=instance.pk).values_list('course_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Module)
+def count_module_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        course_stats.adjust(instance.course_id, module_count=1)
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is not None and previous != instance.course_id:
+        course_stats.rebuild(Course.objects.filter(pk__in=(previous, instance.course_id)))
+
+
+@receiver(post_delete, sender=Module)
+def count_module_delete(sender, instance, **kwargs):
+    course_stats.adjust(instance.course_id, module_count=-1)
+
+
+@receiver(pre_save, sender=Lesson)
+def remember_lesson_placement(sender, instance, raw=False, **kwargs):
+    instance._stats_previous = None
+    if instance.pk and not raw:
+        instance._stats_previous = (
+            Lesson.objects.filter(pk=instance.pk)
+            .values_list('module__course_id', 'duration')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Lesson)
+def count_lesson_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = _lesson_course_id(instance)
+    if created:
+        course_stats.adjust(course_id, lesson_count=1, total_duration=instance.duration)
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is None:
+        return
+    previous_course_id, previous_duration = previous
+    if previous_course_id != course_id:
+        course_stats.adjust(
+            previous_course_id, lesson_count=-1, total_duration=-previous_duration
+        )
+        course_stats.adjust(course_id, lesson_count=1, total_duration=instance.duration)
+    elif previous_duration != instance.duration:
+        course_stats.adjust(course_id, total_duration=instance.duration - previous_duration)
+
+
+@receiver(post_delete, sender=Lesson)
+def count_lesson_delete(sender, instance, **kwargs):
+    course_stats.adjust(
+        _lesson_course_id(instance), lesson_count=-1, total_duration=-instance.duration
+    )
+
+
+@receiver(post_save, sender=Enrollment)
+def count_enrollment_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        course_stats.adjust(instance.course_id, enrollment_count=1)
+
+
+@receiver(post_delete, sender=Enrollment)
+def count_enrollment_delete(sender, instance, **kwargs):
+    course_stats.adjust(instance.course_id, enrollment_count=-1)
+
+
+# --- Full-text search document --------------------------------------------
+
+def _refresh_search_on_commit(course_id):
+    if course_id is not None:
+        transaction.on_commit(lambda: course_search.update_search_vectors([course_id]))
+
+
+@receiver(post_save, sender=Course)
+def refresh_course_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _refresh_search_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def refresh_module_search(sender, instance, signal, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_search_on_commit(instance.course_id)
+    # A module moved to another course takes its lessons' text with it.
+    _refresh_search_on_commit(_moved_from(instance, signal, instance.course_id))
+
+
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def refresh_lesson_search(sender, instance, signal, raw=False, **kwargs):
+    if raw:
+        return
+    course_id = _lesson_course_id(instance)
+    _refresh_search_on_commit(course_id)
+    _refresh_search_on_commit(_moved_from(instance, signal, course_id))
+
+
+# --- Image variants -------------------------------------------------------
+
+@receiver(pre_save, sender=Course)
+def remember_course_image(sender, instance, raw=False, **kwargs):
+    instance._image_previous = None
+    if instance.pk and not raw:
+        instance._image_previous = (
+            Course.objects.filter(pk=instance.pk).values_list('image', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Course)
+def schedule_course_image_variants(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.image:
+        return
+    if created or instance.image.name != getattr(instance, '_image_previous', None):
+        # Enqueued in the same transaction, so the job only exists if the save commits.
+        course_tasks.generate_image_variants.enqueue(course_id=instance.pk)
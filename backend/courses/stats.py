@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.db.models import Count, DurationField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Course, Enrollment, Lesson, Module
+
+STAT_FIELDS = ('module_count', 'lesson_count', 'total_duration', 'enrollment_count')
+
+
+def _subquery(queryset, group_field, aggregate, output_field, empty):
+    values = (
+        queryset.filter(**{group_field: OuterRef('pk')})
+        .order_by()
+        .values(group_field)
+        .annotate(value=aggregate)
+        .values('value')
+    )
+    return Coalesce(Subquery(values, output_field=output_field), Value(empty), output_field=output_field)
+
+
+def computed_stats():
+    """
+    Expressions computing every counter from the source tables.
+    """
+    return {
+        'module_count': _subquery(
+            Module.objects.all(), 'course', Count('pk'), IntegerField(), 0
+        ),
+        'lesson_count': _subquery(
+            Lesson.objects.all(), 'module__course', Count('pk'), IntegerField(), 0
+        ),
+        'total_duration': _subquery(
+            Lesson.objects.all(), 'module__course', Sum('duration'), DurationField(), timedelta(0)
+        ),
+        'enrollment_count': _subquery(
+            Enrollment.objects.all(), 'course', Count('pk'), IntegerField(), 0
+        ),
+    }
+
+
+def rebuild(queryset=None, batch_size=1000) -> int:
+    """
+    Recompute the counters of ``queryset`` (all courses by default) in batches.
+
+    Each batch is a single ``UPDATE ... SET col = (SELECT ...)`` statement.
+    """
+    queryset = (queryset if queryset is not None else Course.objects.all()).order_by('pk')
+    ids = list(queryset.values_list('pk', flat=True))
+    for start in range(0, len(ids), batch_size):
+        Course.objects.filter(pk__in=ids[start:start + batch_size]).update(**computed_stats())
+    return len(ids)
+
+
+def find_inconsistent(queryset=None):
+    """
+    Return the courses whose stored counters differ from the source tables.
+    """
+    queryset = queryset if queryset is not None else Course.objects.all()
+    expected = {f'expected_{name}': expr for name, expr in computed_stats().items()}
+    mismatch = Q()
+    for name in STAT_FIELDS:
+        mismatch |= ~Q(**{name: F(f'expected_{name}')})
+    return queryset.annotate(**expected).filter(mismatch)
+
+
+def adjust(course_id, **deltas):
+    """
+    Apply incremental changes, e.g. ``adjust(5, lesson_count=1)``.
+    """
+    if course_id is None or not deltas:
+        return
+    Course.objects.filter(pk=course_id).update(
+        **{name: F(name) + delta for name, delta in deltas.items()}
+    )
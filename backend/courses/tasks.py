@@ -0,0 +1,21 @@
+from jobs.queue import task
+
+from . import cache as course_cache
+from . import images as course_images
+from . import search as course_search
+from . import stats as course_stats
+from .models import Course
+
+
+# Pillow work is CPU bound; keep it from starving the other queues' workers.
+@task('courses.generate_image_variants', concurrency=2)
+def generate_image_variants(course_id):
+    course_images.generate_variants(course_id)
+
+
+@task('courses.rebuild_course_data')
+def rebuild_course_data(course_ids):
+    course_stats.rebuild(Course.objects.filter(pk__in=course_ids))
+    course_search.update_search_vectors(course_ids)
+    for course_id in course_ids:
+        course_cache.invalidate_course(course_id)
@@ -0,0 +1,598 @@
+import itertools
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APIClient, APITestCase
+
+from neo_lms.utils import throttling, timing
+from neo_lms.utils.timing import QueryBudgetExceeded
+
+from . import cache as course_cache
+from . import outline, progress
+from . import search as course_search
+from . import stats as course_stats
+from .models import Course, Enrollment, Lesson, LessonProgress, Module
+from .views import iter_lesson_content
+
+User = get_user_model()
+
+
+class MyEnrollmentsQueryCountTests(APITestCase):
+    """
+    The "my learning" listing must not grow queries with the number of enrollments.
+    """
+
+    url = '/api/courses/enrollments/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student', 'student@example.com', 'pass')
+        cls.instructors = [
+            User.objects.create_user(f'instructor{i}', f'instructor{i}@example.com', 'pass',
+                                     role=User.Roles.INSTRUCTOR)
+            for i in range(3)
+        ]
+        cls.courses = []
+        for i in range(12):
+            course = Course.objects.create(
+                title=f'Course {i}',
+                slug=f'course-{i}',
+                description='desc',
+                instructor=cls.instructors[i % 3],
+                is_published=True,
+                image='course_images/test.png',
+            )
+            module = Module.objects.create(course=course, title='Module', order=1)
+            for order in range(3):
+                Lesson.objects.create(
+                    module=module,
+                    title=f'Lesson {order}',
+                    content='body',
+                    video_url='https://example.com/video',
+                    duration=timedelta(minutes=5),
+                    order=order,
+                )
+            cls.courses.append(course)
+
+    def setUp(self):
+        self.client.force_authenticate(self.student)
+
+    def _enroll(self, count):
+        Enrollment.objects.bulk_create(
+            [Enrollment(user=self.student, course=course) for course in self.courses[:count]]
+        )
+
+    def test_single_enrollment(self):
+        self._enroll(1)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_query_count_is_independent_of_enrollments(self):
+        self._enroll(12)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual(len(results), 12)
+        self.assertNotIn('modules', results[0]['course'])
+        self.assertEqual(results[0]['course']['lesson_count'], 3)
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    With API_TIMING on, responses carry Server-Timing and strict budgets fail loudly.
+    """
+
+    url = '/api/courses/enrollments/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student', 'student@example.com', 'pass')
+
+    def _client(self):
+        # Middleware is loaded per client, so build it inside the settings override.
+        client = APIClient()
+        client.force_authenticate(self.student)
+        return client
+
+    def test_server_timing_header(self):
+        with self.settings(API_TIMING=True, API_QUERY_BUDGET_STRICT=True):
+            response = self._client().get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+    def test_serializer_time_without_patching_drf(self):
+        # Every clock read advances one second: one serializer.data call is 1000 ms.
+        clock = mock.patch.object(timing.time, 'perf_counter', side_effect=itertools.count())
+        with self.settings(API_TIMING=True), clock:
+            response = self._client().get(self.url)
+        self.assertIn('serialize;dur=1000.0', response['Server-Timing'])
+        self.assertEqual(BaseSerializer.data.fget.__module__, 'rest_framework.serializers')
+
+    def test_budget_exceeded_raises_in_strict_mode(self):
+        with self.settings(
+            API_TIMING=True,
+            API_QUERY_BUDGET_STRICT=True,
+            API_QUERY_BUDGETS={'EnrollmentViewSet.list': 0},
+        ):
+            with self.assertRaises(QueryBudgetExceeded):
+                self._client().get(self.url)
+
+
+@override_settings(PROGRESS_FLUSH_INTERVAL=0)
+class LessonProgressTests(APITestCase):
+    """
+    Heartbeats merge into one row per lesson and roll up to the enrollment.
+    """
+
+    url = '/api/courses/progress/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('student', 'student@example.com', 'pass')
+        instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                              role=User.Roles.INSTRUCTOR)
+        cls.course = Course.objects.create(
+            title='Course', slug='course', description='desc', instructor=instructor,
+            is_published=True, image='course_images/test.png',
+        )
+        module = Module.objects.create(course=cls.course, title='Module', order=1)
+        cls.lessons = [
+            Lesson.objects.create(
+                module=module, title=f'Lesson {order}', content='body',
+                video_url='https://example.com/video', duration=timedelta(seconds=100), order=order,
+            )
+            for order in range(4)
+        ]
+        Enrollment.objects.create(user=cls.student, course=cls.course)
+
+    def setUp(self):
+        self.client.force_authenticate(self.student)
+
+    def _percent(self):
+        return self.client.get('/api/courses/enrollments/').data['results'][0]['progress_percent']
+
+    def test_heartbeats_roll_up_to_course_percent(self):
+        first, second = self.lessons[0].pk, self.lessons[1].pk
+        beats = [
+            {'lesson': first, 'position': 30},
+            {'lesson': first, 'position': 90.5},
+            {'lesson': first, 'position': 10},  # rewinding keeps the furthest point
+            {'lesson': second, 'position': 20, 'completed': True},
+        ]
+        # Two lookups, one upsert and one enrollment UPDATE (+ savepoint pair).
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, beats, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self._percent(), 47.5)  # (90 + 100) / 400
+
+        self.client.post(self.url, {'lesson': second, 'position': 5}, format='json')
+        rows = self.client.get(self.url, {'course': self.course.pk}).data
+        self.assertEqual(
+            [(row['lesson'], row['position'], row['completed']) for row in rows],
+            [(first, 90, False), (second, 20, True)],
+        )
+        self.assertEqual(Enrollment.objects.get().completed_lessons, 1)
+
+    def test_unenrolled_lessons_are_dropped(self):
+        Enrollment.objects.all().delete()
+        response = self.client.post(self.url, {'lesson': self.lessons[0].pk, 'position': 50}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(LessonProgress.objects.exists())
+
+    def test_buffer_coalesces_until_flushed(self):
+        buffer = progress.heartbeat_buffer(interval=60, max_size=1000)
+        for position in (10, 40, 25):
+            buffer.add((self.student.pk, self.lessons[2].pk), (position, False))
+        self.assertFalse(LessonProgress.objects.exists())
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(LessonProgress.objects.get().position, 40)
+        self.assertEqual(self._percent(), 10.0)
+
+
+class SearchDocumentSignalTests(APITestCase):
+    """
+    Module saves and deletes refresh the search document of every course involved.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                              role=User.Roles.INSTRUCTOR)
+        cls.first, cls.second = (
+            Course.objects.create(
+                title=slug, slug=slug, description='desc', instructor=instructor,
+                is_published=True, image='course_images/test.png',
+            )
+            for slug in ('first', 'second')
+        )
+        cls.module = Module.objects.create(course=cls.first, title='Module', order=1)
+
+    def _refreshed(self, change):
+        with mock.patch.object(course_search, 'update_search_vectors') as update:
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+        return {course_id for call in update.call_args_list for course_id in call.args[0]}
+
+    def test_moving_a_module_refreshes_both_courses(self):
+        def move():
+            self.module.course = self.second
+            self.module.save()
+
+        self.assertEqual(self._refreshed(move), {self.first.pk, self.second.pk})
+        self.assertEqual(self._refreshed(self.module.delete), {self.second.pk})
+
+    def test_moving_a_lesson_refreshes_both_courses(self):
+        lesson = Lesson.objects.create(
+            module=self.module, title='Lesson', content='body',
+            video_url='https://example.com/video', duration=timedelta(minutes=1), order=1,
+        )
+        target = Module.objects.create(course=self.second, title='Target', order=1)
+
+        def move():
+            lesson.module = target
+            lesson.save()
+
+        self.assertEqual(self._refreshed(move), {self.first.pk, self.second.pk})
+        self.assertEqual(self._refreshed(lesson.save), {self.second.pk})
+
+
+class CatalogCacheTests(APITestCase):
+    """
+    Catalog responses are cached per visibility class and dropped on commit
+    of any course, module or lesson change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                                  role=User.Roles.INSTRUCTOR)
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pass', role=User.Roles.ADMIN)
+        cls.course = Course.objects.create(
+            title='Course', slug='course', description='desc', instructor=cls.instructor,
+            is_published=True, image='course_images/test.png',
+        )
+        cls.draft = Course.objects.create(
+            title='Draft', slug='draft', description='desc', instructor=cls.instructor,
+            image='course_images/test.png',
+        )
+        cls.module = Module.objects.create(course=cls.course, title='Module', order=1)
+        cls.lesson = Lesson.objects.create(
+            module=cls.module, title='Lesson', content='body',
+            video_url='https://example.com/video', duration=timedelta(minutes=1), order=1,
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Each test gets fresh throttle counters.
+        patcher = mock.patch.object(throttling, '_store', throttling.LocalWindowStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get(self, url='/api/courses/', user=None):
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_hit_after_miss(self):
+        for url in ('/api/courses/', f'/api/courses/{self.course.pk}/'):
+            self.assertEqual(self._get(url)['X-Cache'], 'MISS')
+            self.assertEqual(self._get(url)['X-Cache'], 'HIT')
+        self.assertEqual(course_cache.stats()['hits'], 2)
+
+    def test_changes_invalidate_on_commit(self):
+        changes = [
+            (self.course, lambda: self.course.save()),
+            (self.course, lambda: self.module.save()),
+            (self.course, lambda: self.lesson.save()),
+            (self.course, lambda: Lesson.objects.create(
+                module=self.module, title='New', content='body', video_url='https://example.com/v',
+                duration=timedelta(minutes=1), order=2,
+            ).delete()),
+            (self.course, lambda: Module.objects.create(course=self.course, title='New', order=2).delete()),
+            (self.draft, lambda: self.draft.delete()),
+        ]
+        for course, change in changes:
+            urls = ('/api/courses/', f'/api/courses/{course.pk}/')
+            for url in urls:
+                self._get(url, self.admin)
+            with self.captureOnCommitCallbacks() as callbacks:
+                change()
+            # Nothing is dropped until the transaction commits.
+            self.assertEqual(self._get(user=self.admin)['X-Cache'], 'HIT')
+            for callback in callbacks:
+                callback()
+            self.assertEqual(self._get(user=self.admin)['X-Cache'], 'MISS')
+            if course.pk is not None:
+                self.assertEqual(self._get(urls[1], self.admin)['X-Cache'], 'MISS')
+
+    def test_moves_invalidate_the_course_left_behind(self):
+        target = Module.objects.create(course=self.draft, title='Target', order=1)
+        detail = f'/api/courses/{self.course.pk}/'
+
+        def lesson_move():
+            self.lesson.module = target
+            self.lesson.save()
+
+        def module_move():
+            self.module.course = self.draft
+            self.module.save()
+
+        for change in (lesson_move, module_move):
+            self._get(detail, self.admin)
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self._get(detail, self.admin)
+            self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['modules'], [])
+
+    def test_deletes_and_unpublishing_move_validators(self):
+        def unpublish():
+            self.course.is_published = False
+            self.course.save()
+
+        past = timezone.now() - timedelta(hours=1)
+        changes = [lambda: self.lesson.delete(), unpublish]
+        for change in changes:
+            for model in (Course, Module, Lesson):
+                model.objects.update(updated_at=past)
+            cache.clear()
+            cache.set(course_cache.CHANGED_AT_KEY, past, None)
+            first = self._get()
+            self.assertEqual(first['Last-Modified'], http_date(past.timestamp()))
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self.client.get(
+                '/api/courses/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+            )
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get('/api/courses/', HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 200)
+
+    def test_partitioned_by_visibility(self):
+        self._get()
+        for user in (self.instructor, self.admin):
+            response = self._get(user=user)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertEqual({row['slug'] for row in response.data['results']}, {'course', 'draft'})
+        response = self._get()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual([row['slug'] for row in response.data['results']], ['course'])
+
+
+class LessonAccessTests(APITestCase):
+    """
+    HasLessonAccess: free lessons are open, others need enrollment or ownership.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                                  role=User.Roles.INSTRUCTOR)
+        cls.student = User.objects.create_user('student', 'student@example.com', 'pass')
+        cls.enrolled = User.objects.create_user('enrolled', 'enrolled@example.com', 'pass')
+        course = Course.objects.create(
+            title='Course', slug='course', description='desc', instructor=cls.instructor,
+            is_published=True, image='course_images/test.png',
+        )
+        module = Module.objects.create(course=course, title='Module', order=1)
+        cls.free, cls.paid = (
+            Lesson.objects.create(
+                module=module, title=title, content=title * 5, is_free=is_free,
+                video_url='https://example.com/video', duration=timedelta(minutes=1), order=order,
+            )
+            for order, (title, is_free) in enumerate((('free', True), ('paid', False)))
+        )
+        Enrollment.objects.create(user=cls.enrolled, course=course)
+
+    def setUp(self):
+        patcher = mock.patch.object(throttling, '_store', throttling.LocalWindowStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _content(self, lesson, user=None):
+        self.client.force_authenticate(user)
+        url = f'/api/courses/{lesson.module.course_id}/lessons/{lesson.pk}/content/'
+        return self.client.get(url)
+
+    def test_free_lesson_is_open(self):
+        response = self._content(self.free)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'free' * 5)
+
+    def test_paid_lesson(self):
+        self.assertEqual(self._content(self.paid).status_code, 401)
+        self.assertEqual(self._content(self.paid, self.student).status_code, 403)
+        for user in (self.enrolled, self.instructor):
+            response = self._content(self.paid, user)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content), b'paid' * 5)
+
+    def test_body_is_streamed_in_slices(self):
+        self.assertEqual(list(iter_lesson_content('abcdefg', chunk_size=3)), ['abc', 'def', 'g'])
+        self.assertEqual(list(iter_lesson_content('')), [])
+
+
+class BulkEnrollmentTests(APITestCase):
+    """
+    Bulk enrollment counts only the rows it inserted.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                                  role=User.Roles.INSTRUCTOR)
+        cls.course = Course.objects.create(
+            title='Course', slug='course', description='desc', instructor=cls.instructor,
+            is_published=True, image='course_images/test.png',
+        )
+        cls.students = [
+            User.objects.create_user(f'student{n}', f'student{n}@example.com', 'pass')
+            for n in range(3)
+        ]
+        cls.inactive = User.objects.create_user('inactive', 'inactive@example.com', 'pass',
+                                                is_active=False)
+        Enrollment.objects.create(user=cls.students[0], course=cls.course)
+
+    def test_mixed_new_duplicate_and_unknown_ids(self):
+        self.client.force_authenticate(self.instructor)
+        enrolled, new, other = self.students
+        unknown = max(user.pk for user in User.objects.all()) + 1
+        users = [enrolled.pk, new.pk, new.pk, other.pk, unknown, self.inactive.pk]
+        response = self.client.post(
+            '/api/courses/enrollments/bulk/', {'course': self.course.pk, 'users': users}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        # The repeated id counts once; enrolled, unknown and inactive are skipped.
+        self.assertEqual(response.data, {'created': 2, 'skipped': 3})
+        self.assertEqual(
+            set(Enrollment.objects.values_list('user_id', flat=True)),
+            {enrolled.pk, new.pk, other.pk},
+        )
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.enrollment_count, 3)
+
+        response = self.client.post(
+            '/api/courses/enrollments/bulk/', {'course': self.course.pk, 'users': users}, format='json'
+        )
+        self.assertEqual(response.data, {'created': 0, 'skipped': 5})
+
+
+@override_settings(AUTH_TOKEN_USER=True)
+class TokenUserOwnershipTests(APITestCase):
+    """
+    Ownership checks hold for the claim-backed request user as well.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                                  role=User.Roles.INSTRUCTOR)
+        cls.student = User.objects.create_user('student', 'student@example.com', 'pass')
+        cls.course = Course.objects.create(
+            title='Course', slug='course', description='desc', instructor=cls.instructor,
+            is_published=True, image='course_images/test.png',
+        )
+        cls.module = Module.objects.create(course=cls.course, title='Module', order=1)
+        cls.lesson = Lesson.objects.create(
+            module=cls.module, title='Lesson', content='body',
+            video_url='https://example.com/video', duration=timedelta(minutes=1), order=1,
+        )
+
+    def setUp(self):
+        patcher = mock.patch.object(throttling, '_store', throttling.LocalWindowStore())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.post('/api/token/', {'username': 'instructor', 'password': 'pass'})
+
+    def test_instructor_owns_their_course(self):
+        response = self.client.get(f'/api/courses/{self.course.pk}/lessons/{self.lesson.pk}/content/')
+        self.assertEqual(response.status_code, 200)
+        outline_data = {'modules': [{'id': self.module.pk, 'lessons': [{'id': self.lesson.pk}]}]}
+        response = self.client.put(f'/api/courses/{self.course.pk}/outline/', outline_data, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            '/api/courses/enrollments/bulk/',
+            {'course': self.course.pk, 'users': [self.student.pk]},
+            format='json',
+        )
+        self.assertEqual(response.data, {'created': 1, 'skipped': 0})
+
+
+class CourseOutlineTests(APITestCase):
+    """
+    PUT /outline/ applies a whole structure edit, touching only moved rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructor = User.objects.create_user('instructor', 'instructor@example.com', 'pass',
+                                                  role=User.Roles.INSTRUCTOR)
+        cls.course = Course.objects.create(
+            title='Course', slug='course', description='desc', instructor=cls.instructor,
+            is_published=True, image='course_images/test.png',
+        )
+        cls.modules = [
+            Module.objects.create(course=cls.course, title=f'Module {n}', order=n * outline.ORDER_GAP)
+            for n in (1, 2)
+        ]
+        cls.lessons = [
+            Lesson.objects.create(
+                module=cls.modules[0], title=f'Lesson {n}', content='body',
+                video_url='https://example.com/video', duration=timedelta(minutes=5),
+                order=n * outline.ORDER_GAP,
+            )
+            for n in (1, 2, 3, 4)
+        ]
+        cls.url = f'/api/courses/{cls.course.pk}/outline/'
+
+    def setUp(self):
+        self.client.force_authenticate(self.instructor)
+
+    def _outline(self, first_lessons, second_lessons):
+        return {'modules': [
+            {'id': self.modules[0].pk, 'lessons': first_lessons},
+            {'id': self.modules[1].pk, 'lessons': second_lessons},
+        ]}
+
+    def test_moving_one_lesson_rewrites_one_row(self):
+        a, b, c, d = (lesson.pk for lesson in self.lessons)
+        before = dict(Lesson.objects.values_list('pk', 'order'))
+        response = self.client.put(
+            self.url, self._outline([{'id': a}, {'id': d}, {'id': b}, {'id': c}], []), format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        after = dict(Lesson.objects.values_list('pk', 'order'))
+        self.assertEqual([pk for pk, _ in sorted(after.items(), key=lambda item: item[1])], [a, d, b, c])
+        self.assertEqual({pk for pk in after if after[pk] != before[pk]}, {d})
+        titles = [lesson['title'] for lesson in response.data['modules'][0]['lessons']]
+        self.assertEqual(titles, ['Lesson 1', 'Lesson 4', 'Lesson 2', 'Lesson 3'])
+
+    def test_create_move_and_delete_in_one_request(self):
+        a, b, c, d = (lesson.pk for lesson in self.lessons)
+        new = {'title': 'New', 'content': 'x', 'video_url': 'https://example.com/new', 'duration': '00:10:00'}
+        response = self.client.put(self.url, self._outline(
+            [{'id': a}, new, {'id': b, 'title': 'Renamed'}], [{'id': c}],
+        ), format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Lesson.objects.filter(pk=d).exists())
+        self.assertEqual(Lesson.objects.get(pk=c).module_id, self.modules[1].pk)
+        self.assertEqual(Lesson.objects.get(pk=b).title, 'Renamed')
+        course = Course.objects.get()
+        self.assertEqual((course.lesson_count, course.total_duration), (4, timedelta(minutes=25)))
+        self.assertFalse(course_stats.find_inconsistent().exists())
+
+        self.client.put(self.url, {'modules': [{'id': self.modules[1].pk, 'lessons': []}]}, format='json')
+        course.refresh_from_db()
+        self.assertEqual((course.module_count, course.lesson_count), (1, 0))
+        self.assertFalse(Lesson.objects.exists())
+
+    def test_foreign_ids_and_other_instructors_are_rejected(self):
+        other = Course.objects.create(
+            title='Other', slug='other', description='desc', instructor=self.instructor,
+            image='course_images/test.png',
+        )
+        foreign = Module.objects.create(course=other, title='Foreign', order=1)
+        response = self.client.put(self.url, {'modules': [{'id': foreign.pk, 'lessons': []}]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        stranger = User.objects.create_user('other', 'other@example.com', 'pass', role=User.Roles.INSTRUCTOR)
+        self.client.force_authenticate(stranger)
+        response = self.client.put(self.url, self._outline([], []), format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Lesson.objects.count(), 4)
+
+    def test_order_keys(self):
+        self.assertEqual(outline.order_keys([None, None]), [1024, 2048])
+        self.assertEqual(outline.order_keys([10, None, 20]), [10, 15, 20])
+        # No room between consecutive keys: renumber everything once.
+        self.assertEqual(outline.order_keys([1, None, 2]), [1024, 2048, 3072])
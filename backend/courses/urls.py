@@ -1,8 +1,22 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import CourseViewSet
+from .async_views import AsyncCourseDetailView, AsyncCourseListView
+from .views import CourseViewSet, EnrollmentViewSet, LessonProgressViewSet, LessonViewSet
 
 router = DefaultRouter()
+router.register('enrollments', EnrollmentViewSet, basename='enrollment')
+router.register('progress', LessonProgressViewSet, basename='lesson-progress')
+router.register(r'(?P<course_pk>\d+)/lessons', LessonViewSet, basename='course-lesson')
 router.register('', CourseViewSet, basename='course')
 
 urlpatterns = router.urls
+
+if settings.API_ASYNC_READS:
+    # Catalog GETs take the async-ORM path; other methods fall through to the viewset.
+    urlpatterns = [
+        path('', AsyncCourseListView.as_view(), name='course-list'),
+        path('<int:pk>/', AsyncCourseDetailView.as_view(), name='course-detail'),
+    ] + urlpatterns
+
@@ -1,28 +1,176 @@
-from django.db.models import Q
-from rest_framework import viewsets
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 
+from accounts.authentication import resolve_user
 from accounts.permissions import IsInstructorOrAdminRole
-from .models import Course
-from .serializers import CourseSerializer
+from neo_lms.db_router import ReplicaReadMixin
+from neo_lms.utils.throttling import ProgressRateThrottle
+from neo_lms.utils.timing import SerializerTimingMixin
+from . import cache as course_cache
+from . import progress as lesson_progress
+from . import search as course_search
+from .conditional import course_validators
+from .enrollments import bulk_enroll
+from .outline import apply_outline
+from .models import Course, Enrollment, Lesson, LessonProgress
+from .pagination import (
+    CourseCursorPagination,
+    CourseSearchPagination,
+    EnrollmentCursorPagination,
+)
+from .permissions import HasLessonAccess
+from .serializers import (
+    BulkEnrollmentSerializer,
+    CourseSerializer,
+    CourseStatsSerializer,
+    CourseOutlineSerializer,
+    CourseSummarySerializer,
+    EnrollmentCreateSerializer,
+    HeartbeatSerializer,
+    LessonContentSerializer,
+    LessonProgressSerializer,
+    MyEnrollmentSerializer,
+)
 
+MAX_HEARTBEATS_PER_REQUEST = 100
 
-class CourseViewSet(viewsets.ModelViewSet):
+LESSON_CONTENT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_lesson_content(content, chunk_size=LESSON_CONTENT_CHUNK_SIZE):
+    """
+    Yield a lesson body in ``chunk_size``-character slices.
+
+    The body is read in one query beforehand, so the stream is a single
+    consistent snapshot even if the lesson is edited meanwhile.
+    """
+    for start in range(0, len(content), chunk_size):
+        yield content[start:start + chunk_size]
+
+
+class CourseViewSet(SerializerTimingMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = CourseSerializer
+    pagination_class = CourseCursorPagination
+    lookup_value_regex = r'\d+'
+    replica_actions = ('list', 'retrieve')
+
+    def get_visible_queryset(self):
+        """
+        Courses the requester may see, without any joins or prefetching.
+        """
+        return Course.objects.visible_to(getattr(self.request, 'user', None))
 
     def get_queryset(self):
-        base_qs = Course.objects.select_related('instructor').prefetch_related(
-            'modules__lessons'
+        # The stored search vector is only ever compared in SQL.
+        base_qs = (
+            self.get_visible_queryset().select_related('instructor').defer('search_vector')
         )
-        user = getattr(self.request, 'user', None)
-        if user and user.is_authenticated and getattr(user, 'role', None) == user.Roles.ADMIN:
+        if self.action in ('list', 'stats'):
+            # Counters are denormalized on Course, so never pull lesson rows.
+            query = self.search_query
+            if self.action == 'list' and query:
+                return course_search.search(base_qs, query)
             return base_qs
-        if user and user.is_authenticated and getattr(user, 'role', None) == user.Roles.INSTRUCTOR:
-            return base_qs.filter(Q(is_published=True) | Q(instructor=user))
-        return base_qs.filter(is_published=True)
+        return base_qs.with_outline()
+
+    @property
+    def search_query(self):
+        return self.request.query_params.get('q', '').strip()
+
+    @property
+    def paginator(self):
+        # Ranked search results cannot be keyset-paginated on created_at.
+        if self.action == 'list' and self.search_query and not hasattr(self, '_paginator'):
+            self._paginator = CourseSearchPagination()
+        return super().paginator
+
+    def list(self, request, *args, **kwargs):
+        key = course_cache.list_key(request)
+        return self._cached_response(
+            key, self.get_visible_queryset(), super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        course_id = kwargs[self.lookup_field]
+        key = course_cache.detail_key(request, course_id)
+        courses = self.get_visible_queryset().filter(pk=course_id)
+        return self._cached_response(key, courses, super().retrieve, request, *args, **kwargs)
+
+    def _cached_response(self, key, courses, handler, request, *args, **kwargs):
+        """
+        Serve from the catalog cache, answering conditional GETs with 304.
+
+        Validators are stored next to the cached payload, so a warm cache
+        answers both full and conditional requests without touching the DB.
+        """
+        entry = course_cache.get_cached(key)
+        if entry is not None:
+            etag, last_modified = entry['etag'], entry['last_modified']
+        else:
+            salt = f'{course_cache.visibility_partition(request.user)}:{request.get_full_path()}'
+            etag, last_modified = course_validators(courses, salt=salt)
+
+        last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified_ts
+        )
+        if response is None:
+            if entry is not None:
+                response = Response(entry['data'], headers={'X-Cache': 'HIT'})
+            else:
+                response = handler(request, *args, **kwargs)
+                response['X-Cache'] = 'MISS'
+                if response.status_code == 200:
+                    course_cache.store(key, {
+                        'data': response.data,
+                        'etag': etag,
+                        'last_modified': last_modified,
+                    })
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified_ts:
+                response['Last-Modified'] = http_date(last_modified_ts)
+        return response
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Per-course counters for the reports dashboard.
+        """
+        return super().list(request)
+
+    @action(detail=True, methods=['put'])
+    def outline(self, request, pk=None):
+        """
+        Replace the module/lesson structure in one transaction and return the
+        updated course.
+        """
+        course = get_object_or_404(self.get_visible_queryset().only('pk', 'instructor_id'), pk=pk)
+        user = request.user
+        if user.role != user.Roles.ADMIN and course.instructor_id != user.pk:
+            raise PermissionDenied('فقط مدرس همین دوره یا مدیر می‌تواند ساختار دوره را ویرایش کند.')
+        serializer = CourseOutlineSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        apply_outline(course, serializer.validated_data['modules'])
+        return Response(self.get_serializer(self.get_queryset().get(pk=course.pk)).data)
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CourseSummarySerializer
+        if self.action == 'stats':
+            return CourseStatsSerializer
+        return super().get_serializer_class()
 
     def get_permissions(self):
-        if self.action in ('create', 'update', 'partial_update', 'destroy'):
+        if self.action in ('create', 'update', 'partial_update', 'destroy', 'stats', 'outline'):
             permission_classes = [IsAuthenticated, IsInstructorOrAdminRole]
         else:
             permission_classes = [AllowAny]
@@ -32,4 +180,125 @@ class CourseViewSet(viewsets.ModelViewSet):
         """
         Set the instructor to the current user for new courses.
         """
-        serializer.save(instructor=self.request.user)
+        serializer.save(instructor=resolve_user(self.request.user))
+
+
+class LessonViewSet(SerializerTimingMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Lesson bodies, loaded on demand and gated by HasLessonAccess.
+    """
+
+    serializer_class = LessonContentSerializer
+    permission_classes = [HasLessonAccess]
+    lookup_value_regex = r'\d+'
+
+    def get_queryset(self):
+        visible = Course.objects.visible_to(getattr(self.request, 'user', None))
+        return Lesson.objects.select_related('module__course').filter(
+            module__course_id=self.kwargs['course_pk'],
+            module__course__in=visible.values('pk'),
+        ).defer('module__course__search_vector')
+
+    @action(detail=True, methods=['get'])
+    def content(self, request, *args, **kwargs):
+        """
+        Stream the raw lesson body as text/plain.
+        """
+        lesson = self.get_object()
+        return StreamingHttpResponse(
+            iter_lesson_content(lesson.content),
+            content_type='text/plain; charset=utf-8',
+        )
+
+
+class EnrollmentViewSet(SerializerTimingMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    The requester's enrollments, self-enrollment and bulk cohort enrollment.
+    """
+
+    serializer_class = MyEnrollmentSerializer
+    pagination_class = EnrollmentCursorPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # A single JOIN resolves course and instructor; counters live on Course.
+        return (
+            Enrollment.objects.filter(user_id=self.request.user.pk)
+            .select_related('course__instructor')
+            .defer('course__search_vector')
+        )
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return EnrollmentCreateSerializer
+        if self.action == 'bulk':
+            return BulkEnrollmentSerializer
+        return super().get_serializer_class()
+
+    def get_permissions(self):
+        if self.action == 'bulk':
+            return [IsAuthenticated(), IsInstructorOrAdminRole()]
+        return super().get_permissions()
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        enrollment, created = Enrollment.objects.get_or_create(
+            user_id=request.user.pk,
+            course=serializer.validated_data['course'],
+        )
+        return Response(
+            {'id': enrollment.pk, 'course': enrollment.course_id, 'enrolled_at': enrollment.enrolled_at},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        course = serializer.validated_data['course']
+        user = request.user
+        if user.role != user.Roles.ADMIN and course.instructor_id != user.pk:
+            raise PermissionDenied('فقط مدرس همین دوره یا مدیر می‌تواند ثبت‌نام گروهی انجام دهد.')
+
+        created, skipped = bulk_enroll(course, serializer.validated_data['users'])
+        return Response({'created': created, 'skipped': skipped}, status=status.HTTP_200_OK)
+
+
+class LessonProgressViewSet(SerializerTimingMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Player heartbeats in, and the requester's per-lesson progress of one
+    course (``?course=<id>``) out for resuming playback.
+    """
+
+    serializer_class = LessonProgressSerializer
+    permission_classes = [IsAuthenticated]
+    throttle_classes = (ProgressRateThrottle,)
+    pagination_class = None
+
+    def get_queryset(self):
+        course_id = self.request.query_params.get('course', '')
+        if not course_id.isdigit():
+            return LessonProgress.objects.none()
+        return LessonProgress.objects.filter(
+            user_id=self.request.user.pk, lesson__module__course_id=course_id
+        ).order_by('lesson_id')
+
+    def create(self, request, *args, **kwargs):
+        """
+        Accept one heartbeat or a list of them; they are buffered and written
+        in bulk, so the response only acknowledges receipt.
+        """
+        many = isinstance(request.data, list)
+        if many and len(request.data) > MAX_HEARTBEATS_PER_REQUEST:
+            return Response(
+                {'detail': f'حداکثر {MAX_HEARTBEATS_PER_REQUEST} رویداد در هر درخواست مجاز است.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = HeartbeatSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        heartbeats = serializer.validated_data if many else [serializer.validated_data]
+        lesson_progress.record(request.user.pk, [
+            (beat['lesson'], int(beat['position']), beat['completed']) for beat in heartbeats
+        ])
+        return Response({'accepted': len(heartbeats)}, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'queue', 'status', 'attempts', 'run_after', 'finished_at')
+    list_filter = ('status', 'queue', 'task')
+    search_fields = ('task',)
+    readonly_fields = ('locked_at', 'locked_by', 'last_error', 'created_at', 'finished_at')
+    actions = ('retry_jobs',)
+
+    @admin.action(description='Retry selected jobs')
+    def retry_jobs(self, request, queryset):
+        updated = queryset.exclude(status=Job.Status.RUNNING).update(
+            status=Job.Status.PENDING, attempts=0, run_after=timezone.now(), finished_at=None
+        )
+        self.message_user(request, f'{updated} job(s) queued again.')
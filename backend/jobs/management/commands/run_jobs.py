@@ -0,0 +1,73 @@
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.queue import registry
+from jobs.worker import Worker, default_worker_name, recover_stale_jobs, schedule_periodic
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers against the database queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue', action='append', dest='queues',
+            help='Queue to consume (repeatable, default: "default").',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.JOB_WORKER_THREADS,
+            help='Worker threads in this process, each with its own DB connection.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain the due jobs and exit instead of polling.',
+        )
+
+    def handle(self, *args, **options):
+        queues = options['queues'] or ['default']
+        requeued, exhausted, purged = recover_stale_jobs()
+        if requeued or exhausted or purged:
+            self.stdout.write(
+                f'Requeued {requeued} stale job(s), failed {exhausted}, purged {purged} finished.'
+            )
+
+        if options['once']:
+            worker = Worker(queues)
+            count = 0
+            while worker.run_one():
+                count += 1
+            self.stdout.write(self.style.SUCCESS(f'Ran {count} job(s).'))
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+
+        threads = [
+            threading.Thread(
+                target=Worker(queues, name=f'{default_worker_name()}/{n}').run,
+                args=(stop,),
+                name=f'job-worker-{n}',
+            )
+            for n in range(max(1, options['threads']))
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f'{len(threads)} worker(s) consuming {", ".join(queues)}.')
+
+        # While the threads poll: keep periodic tasks scheduled and
+        # periodically requeue jobs from crashed workers.
+        intervals = [entry.every for entry in registry.values() if entry.every]
+        tick = min([settings.JOB_LOCK_TIMEOUT / 2, *intervals])
+        recovered_at = time.monotonic()
+        schedule_periodic(queues)
+        while not stop.wait(tick):
+            schedule_periodic(queues)
+            if time.monotonic() - recovered_at >= settings.JOB_LOCK_TIMEOUT / 2:
+                recover_stale_jobs()
+                recovered_at = time.monotonic()
+        for thread in threads:
+            thread.join()
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Job
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: object
+    queue: str = 'default'
+    max_attempts: int = 3
+    # Upper bound on jobs of this task running at once across all workers.
+    concurrency: int | None = None
+    # Seconds between runs for periodic tasks, scheduled by ``run_jobs``.
+    every: int | None = None
+
+    def enqueue(self, **payload):
+        return enqueue(self.name, **payload)
+
+
+registry: dict[str, Task] = {}
+
+
+def task(name=None, *, queue='default', max_attempts=3, concurrency=None, every=None):
+    """
+    Register ``func`` as a job task; call ``func.enqueue(**payload)`` to defer it.
+
+    Payloads are stored as JSON, so pass ids rather than model instances.
+    Tasks with ``every`` take no payload and are enqueued by the workers.
+    """
+
+    def decorator(func):
+        entry = Task(
+            name=name or f'{func.__module__}.{func.__name__}',
+            func=func,
+            queue=queue,
+            max_attempts=max_attempts,
+            concurrency=concurrency,
+            every=every,
+        )
+        registry[entry.name] = entry
+        func.enqueue = entry.enqueue
+        func.task = entry
+        return func
+
+    return decorator
+
+
+def enqueue(name, *, delay: timedelta | None = None, priority=0, **payload):
+    """
+    Insert a pending job. Inside a transaction the job commits (or rolls back)
+    together with the data it refers to.
+    """
+    entry = registry[name]
+    run_after = timezone.now() + delay if delay else timezone.now()
+    return Job.objects.create(
+        task=entry.name,
+        payload=payload,
+        queue=entry.queue,
+        priority=priority,
+        max_attempts=entry.max_attempts,
+        run_after=run_after,
+    )
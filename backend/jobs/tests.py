@@ -0,0 +1,123 @@
+import threading
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import enqueue, registry, task
+from .worker import Worker, recover_stale_jobs, schedule_periodic
+
+
+def register_test_tasks(testcase):
+    patcher = mock.patch.dict(registry)
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+
+    @task('tests.noop')
+    def noop(**payload):
+        pass
+
+    @task('tests.fail', max_attempts=2)
+    def fail():
+        raise RuntimeError('boom')
+
+
+class WorkerTests(TransactionTestCase):
+    """
+    Claiming, retries with backoff and recovery of jobs from lost workers,
+    against committed rows.
+    """
+
+    def setUp(self):
+        register_test_tasks(self)
+        self.worker = Worker(name='worker-1')
+
+    def test_claim_order_and_exclusivity(self):
+        low = enqueue('tests.noop')
+        high = enqueue('tests.noop', priority=5)
+        enqueue('tests.noop', delay=timedelta(hours=1))
+        self.assertEqual(self.worker.claim().pk, high.pk)
+        self.assertEqual(Worker(name='worker-2').claim().pk, low.pk)
+        # The rest is either claimed already or not due yet.
+        self.assertIsNone(Worker(name='worker-3').claim())
+        self.assertEqual(Job.objects.get(pk=high.pk).locked_by, 'worker-1')
+
+    @override_settings(JOB_RETRY_BACKOFF=10)
+    def test_failures_back_off_then_fail(self):
+        job = enqueue('tests.fail')
+        before = timezone.now()
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            self.assertTrue(self.worker.run_one())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.PENDING, 1))
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=10))
+        self.assertIn('boom', job.last_error)
+        self.assertFalse(self.worker.run_one())
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('jobs.worker', 'ERROR'):
+            self.assertTrue(self.worker.run_one())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    @override_settings(JOB_LOCK_TIMEOUT=60)
+    def test_stale_jobs_are_recovered(self):
+        old = timezone.now() - timedelta(minutes=5)
+        running = {'task': 'tests.noop', 'status': Job.Status.RUNNING, 'locked_at': old}
+        lost = Job.objects.create(**running, attempts=1, locked_by='gone')
+        exhausted = Job.objects.create(**running, attempts=3, locked_by='gone')
+        # A long job whose worker is alive keeps its lock fresh.
+        alive = Job.objects.create(**running, attempts=1, locked_by=self.worker.name)
+        self.assertEqual(self.worker.beat(alive), 1)
+
+        self.assertEqual(recover_stale_jobs(), (1, 1, 0))
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[lost.pk], Job.Status.PENDING)
+        self.assertEqual(statuses[exhausted.pk], Job.Status.FAILED)
+        self.assertEqual(statuses[alive.pk], Job.Status.RUNNING)
+
+    def test_periodic_task_is_scheduled_once(self):
+        @task('tests.periodic', every=60)
+        def periodic():
+            pass
+
+        schedule_periodic()
+        self.assertEqual(schedule_periodic(), 0)
+        self.assertEqual(Job.objects.filter(task='tests.periodic').count(), 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'SKIP LOCKED needs PostgreSQL')
+class SkipLockedClaimTests(TransactionTestCase):
+    """
+    A row locked by another transaction is skipped, not waited on.
+    """
+
+    def setUp(self):
+        register_test_tasks(self)
+
+    def test_locked_row_is_skipped(self):
+        first = enqueue('tests.noop')
+        second = enqueue('tests.noop')
+        locked, release = threading.Event(), threading.Event()
+
+        def hold():
+            try:
+                with transaction.atomic():
+                    Job.objects.select_for_update().get(pk=first.pk)
+                    locked.set()
+                    release.wait(5)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        locked.wait(5)
+        try:
+            self.assertEqual(Worker().claim().pk, second.pk)
+        finally:
+            release.set()
+            holder.join()
@@ -0,0 +1,212 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Job
+from .queue import enqueue, registry
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def _advisory_lock(key):
+    """
+    On PostgreSQL, serialize callers holding ``key`` until the transaction ends.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [key])
+
+
+class Worker:
+    """
+    Claims and runs pending jobs from the given queues, one at a time.
+
+    Several workers (threads or processes) can run side by side: the claim
+    uses ``FOR UPDATE SKIP LOCKED`` so each pending row goes to one worker.
+    """
+
+    def __init__(self, queues=('default',), name=None):
+        self.queues = tuple(queues)
+        self.name = name or default_worker_name()
+
+    def claim(self):
+        now = timezone.now()
+        with transaction.atomic():
+            pending = (
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(status=Job.Status.PENDING, queue__in=self.queues, run_after__lte=now)
+                .order_by('-priority', 'id')
+            )
+            saturated = self._saturated_tasks()
+            if saturated:
+                pending = pending.exclude(task__in=saturated)
+            job = pending.first()
+            if job is None or not self._has_slot(job.task):
+                return None
+            job.status = Job.Status.RUNNING
+            job.attempts += 1
+            job.locked_at = now
+            job.locked_by = self.name
+            job.save(update_fields=['status', 'attempts', 'locked_at', 'locked_by'])
+        return job
+
+    def run_one(self):
+        """
+        Run the next due job; returns False when there was nothing to do.
+        """
+        job = self.claim()
+        if job is None:
+            return False
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job, stop), name=f'job-heartbeat-{job.pk}', daemon=True
+        )
+        heartbeat.start()
+        try:
+            entry = registry.get(job.task)
+            if entry is None:
+                raise LookupError(f'Unknown task {job.task!r}')
+            entry.func(**job.payload)
+        except Exception:
+            logger.exception('Job %s (%s) failed on attempt %s', job.pk, job.task, job.attempts)
+            self._fail(job, traceback.format_exc())
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.DONE, finished_at=timezone.now(), locked_at=None, last_error=''
+            )
+        finally:
+            stop.set()
+            heartbeat.join()
+        return True
+
+    def beat(self, job):
+        """
+        Refresh the lock of a job this worker is running.
+        """
+        return Job.objects.filter(
+            pk=job.pk, status=Job.Status.RUNNING, locked_by=self.name
+        ).update(locked_at=timezone.now())
+
+    def _heartbeat(self, job, stop):
+        # Keeps locked_at well inside JOB_LOCK_TIMEOUT so recover_stale_jobs
+        # only requeues jobs whose worker is gone, however long they run.
+        try:
+            while not stop.wait(settings.JOB_LOCK_TIMEOUT / 3):
+                try:
+                    self.beat(job)
+                except Exception:
+                    logger.exception('Could not refresh the lock of job %s', job.pk)
+        finally:
+            connection.close()
+
+    def run(self, stop_event, poll_interval=None):
+        poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+        while not stop_event.is_set():
+            # Recycle broken or expired connections between jobs, as Django
+            # does between requests; run_one itself may be inside a transaction.
+            close_old_connections()
+            try:
+                busy = self.run_one()
+            except Exception:
+                # Lost DB connection and the like; back off and retry.
+                logger.exception('Worker %s could not claim a job', self.name)
+                busy = False
+            if not busy:
+                stop_event.wait(poll_interval)
+
+    def _fail(self, job, error):
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            delay = timedelta(seconds=settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1))
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.PENDING, run_after=now + delay, locked_at=None, last_error=error
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.FAILED, finished_at=now, locked_at=None, last_error=error
+            )
+
+    def _limits(self):
+        return {
+            name: entry.concurrency
+            for name, entry in registry.items()
+            if entry.concurrency and entry.queue in self.queues
+        }
+
+    def _saturated_tasks(self):
+        limits = self._limits()
+        if not limits:
+            return []
+        running = (
+            Job.objects.filter(status=Job.Status.RUNNING, task__in=limits)
+            .values_list('task')
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+        return [name for name, n in running if n >= limits[name]]
+
+    def _has_slot(self, task_name):
+        limit = self._limits().get(task_name)
+        if limit is None:
+            return True
+        # Serialize claimers of this task until commit so the recount is exact.
+        _advisory_lock(f'jobs:{task_name}')
+        running = Job.objects.filter(status=Job.Status.RUNNING, task=task_name).count()
+        return running < limit
+
+
+def recover_stale_jobs():
+    """
+    Requeue jobs whose worker died mid-run; drop old finished rows.
+
+    Running jobs are kept fresh by their worker's heartbeat, so a lock older
+    than JOB_LOCK_TIMEOUT means the worker is gone.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status=Job.Status.RUNNING,
+        locked_at__lt=now - timedelta(seconds=settings.JOB_LOCK_TIMEOUT),
+    )
+    exhausted = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.Status.FAILED, finished_at=now, locked_at=None, last_error='Worker lost.'
+    )
+    requeued = stale.update(status=Job.Status.PENDING, locked_at=None, locked_by='')
+    purged, _ = Job.objects.filter(
+        status=Job.Status.DONE,
+        finished_at__lt=now - timedelta(days=settings.JOB_RETENTION_DAYS),
+    ).delete()
+    return requeued, exhausted, purged
+
+
+def schedule_periodic(queues=('default',)):
+    """
+    Enqueue the next run of each periodic task that has none pending or running.
+
+    Every worker process calls this; the per-task lock makes the check and the
+    insert one step, so concurrent schedulers enqueue a single run.
+    """
+    scheduled = 0
+    for name, entry in registry.items():
+        if not entry.every or entry.queue not in queues:
+            continue
+        with transaction.atomic():
+            _advisory_lock(f'jobs:periodic:{name}')
+            active = Job.objects.filter(
+                task=name, status__in=(Job.Status.PENDING, Job.Status.RUNNING)
+            ).exists()
+            if not active:
+                enqueue(name, delay=timedelta(seconds=entry.every))
+                scheduled += 1
+    return scheduled
@@ -0,0 +1,56 @@
+from django.db import connections
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsAdminRole
+
+
+def pool_stats():
+    """
+    Per-alias connection stats for this process.
+
+    Pooled aliases report psycopg_pool counters: connections in use and idle,
+    requests waiting, and the mean time requests waited to acquire one.
+    """
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool = getattr(connection, 'pool', None) if connection.vendor == 'postgresql' else None
+        if pool is None:
+            stats[alias] = {
+                'pooled': False,
+                'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+            }
+            continue
+        raw = pool.get_stats()
+        requests = raw.get('requests_num', 0)
+        stats[alias] = {
+            'pooled': True,
+            'min_size': raw.get('pool_min'),
+            'max_size': raw.get('pool_max'),
+            'size': raw.get('pool_size', 0),
+            'in_use': raw.get('pool_size', 0) - raw.get('pool_available', 0),
+            'available': raw.get('pool_available', 0),
+            'waiting': raw.get('requests_waiting', 0),
+            'requests': requests,
+            'acquire_ms_avg': round(raw.get('requests_wait_ms', 0) / requests, 2) if requests else 0.0,
+            'timeouts': raw.get('requests_errors', 0),
+            'connections_opened': raw.get('connections_num', 0),
+            'connect_ms_avg': (
+                round(raw.get('connections_ms', 0) / raw['connections_num'], 2)
+                if raw.get('connections_num') else 0.0
+            ),
+        }
+    return stats
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    Connection/pool stats of the worker process that serves the request.
+    """
+
+    permission_classes = (IsAdminRole,)
+
+    def get(self, request):
+        return Response(pool_stats())
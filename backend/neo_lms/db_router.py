@@ -0,0 +1,116 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Cookie marking a client that wrote recently; its reads stay on the primary.
+PIN_COOKIE = 'db_primary_pin'
+
+
+@dataclass
+class _RoutingState:
+    pinned: bool = False
+    replica_ok: bool = False
+    wrote: bool = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Allow reads inside the block to go to a replica (unless the client is pinned).
+    """
+    state = _state.get()
+    if state is None or not enabled:
+        yield
+        return
+    previous = state.replica_ok
+    state.replica_ok = True
+    try:
+        yield
+    finally:
+        state.replica_ok = previous
+
+
+class ReplicaRouter:
+    """
+    Writes and everything by default go to ``default``; reads inside
+    ``replica_reads()`` go to one of ``DATABASE_REPLICAS``.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.replica_ok
+            or state.pinned
+            or not settings.DATABASE_REPLICAS
+            # Reads inside a transaction must see its own uncommitted writes.
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinMiddleware:
+    """
+    Tracks per request whether replica reads are safe: requests that write
+    set a short-lived cookie, and reads carrying it stay on the primary for
+    DATABASE_REPLICA_PIN_SECONDS (read-your-writes across replica lag).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = _RoutingState(
+            pinned=request.method not in ('GET', 'HEAD', 'OPTIONS') or PIN_COOKIE in request.COOKIES,
+        )
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite='Lax',
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    DRF view mixin: the listed actions (viewsets) or lower-case methods
+    (plain API views) read from a replica.
+    """
+
+    replica_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        action = (getattr(self, 'action_map', None) or {}).get(method, method)
+        with replica_reads(action in self.replica_actions):
+            return super().dispatch(request, *args, **kwargs)
@@ -41,11 +41,13 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
     'accounts',
     'courses',
+    'jobs',
 ]
 
 MIDDLEWARE = [
@@ -55,8 +57,11 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'neo_lms.db_router.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Removes itself unless API_TIMING is on.
+    'neo_lms.utils.timing.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'neo_lms.urls'
@@ -90,9 +95,80 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD"),
         "HOST": os.environ.get("DB_HOST", "db"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        # Reuse connections across requests; verify them before each request.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Optional psycopg 3 connection pool per process (replaces CONN_MAX_AGE, which
+# Django requires to be 0 when pooling). Stats: GET /api/health/db/ (admins).
+if os.environ.get("DB_POOL", "False") == "True":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        },
+    }
+
+# Read replicas ("host" or "host:port", comma separated). Pointing one at the
+# primary's own host (DB_REPLICA_HOSTS=db) exercises the routing locally.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(
+    filter(None, (h.strip() for h in os.environ.get("DB_REPLICA_HOSTS", "").split(","))), start=1
+):
+    host, _, port = replica.partition(":")
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        # Tests read the replica through the test database of the primary.
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['neo_lms.db_router.ReplicaRouter']
+# After a write, the client's reads stay on the primary this long (replica lag).
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get("DB_REPLICA_PIN_SECONDS", "5"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Shared sliding-window counters for the API throttles; without Redis each
+# process keeps its own (neo_lms.utils.throttling.LocalWindowStore).
+THROTTLE_REDIS_URL = os.environ.get("THROTTLE_REDIS_URL", os.environ.get("REDIS_URL", ""))
+
+COURSE_CACHE_TIMEOUT = int(os.environ.get("COURSE_CACHE_TIMEOUT", "300"))
+
+# Lesson player heartbeats are coalesced per (user, lesson) in each process and
+# written in bulk, by a background thread in server processes, every
+# PROGRESS_FLUSH_INTERVAL seconds or once PROGRESS_FLUSH_SIZE pairs are
+# pending. 0 writes every request immediately.
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get("PROGRESS_FLUSH_INTERVAL", "2"))
+PROGRESS_FLUSH_SIZE = int(os.environ.get("PROGRESS_FLUSH_SIZE", "5000"))
+
+# Postgres text search configuration; 'simple' avoids English stemming of Persian text.
+COURSE_SEARCH_CONFIG = os.environ.get("COURSE_SEARCH_CONFIG", "simple")
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -143,13 +219,18 @@ REST_FRAMEWORK = {
         'accounts.authentication.CookieJWTAuthentication',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'neo_lms.utils.throttling.AnonSlidingWindowThrottle',
+        'neo_lms.utils.throttling.UserSlidingWindowThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '10/minute',
-        'user': '100/minute'
-    }
+        'user': '100/minute',
+        # Token endpoints have their own per-IP budgets (see accounts.views).
+        'login': '10/minute',
+        'refresh': '30/minute',
+        # Lesson player heartbeats (courses.views.LessonProgressViewSet).
+        'progress': '120/minute',
+    },
 }
 
 SIMPLE_JWT = {
@@ -157,9 +238,85 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
-    'UPDATE_LAST_LOGIN': True,
+    # Buffered by accounts.activity and flushed in bulk instead of inline per token issue.
+    'UPDATE_LAST_LOGIN': False,
+}
+
+# Resolve API users from token claims (role, is_active) instead of a user-table
+# lookup per request; the full model is then loaded on demand and cached.
+AUTH_TOKEN_USER = os.environ.get("AUTH_TOKEN_USER", "False") == "True"
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", "60"))
+
+# Serve login/registration from async views that hash passwords in a bounded
+# thread pool; requests beyond workers + queue limit get 503 immediately.
+AUTH_ASYNC_VIEWS = os.environ.get("AUTH_ASYNC_VIEWS", "False") == "True"
+AUTH_HASHING_WORKERS = int(os.environ.get("AUTH_HASHING_WORKERS", os.cpu_count() or 2))
+AUTH_HASHING_QUEUE_LIMIT = int(os.environ.get("AUTH_HASHING_QUEUE_LIMIT", "32"))
+
+# Serve catalog GETs and /api/users/me/ from async-ORM views (for ASGI workers).
+API_ASYNC_READS = os.environ.get("API_ASYNC_READS", "False") == "True"
+
+# Server-Timing headers and per-view log lines (logger "neo_lms.timing") for
+# /api/ requests. Views over their query budget log a warning, or raise
+# QueryBudgetExceeded when API_QUERY_BUDGET_STRICT is on (meant for tests).
+API_TIMING = os.environ.get("API_TIMING", "False") == "True"
+API_QUERY_BUDGET_STRICT = os.environ.get("API_QUERY_BUDGET_STRICT", "False") == "True"
+API_QUERY_BUDGET_DEFAULT = None
+API_QUERY_BUDGETS = {
+    'CourseViewSet.list': 5,
+    'CourseViewSet.retrieve': 8,
+    'CourseViewSet.stats': 2,
+    'LessonViewSet.retrieve': 4,
+    'EnrollmentViewSet.list': 2,
+    'EnrollmentViewSet.create': 6,
+    'UserMeView.get': 1,
+}
+
+# Per-view timing lines are printed only while DEBUG is on (the test runner
+# turns it off); budget warnings always are.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'require_debug_true': {'()': 'django.utils.log.RequireDebugTrue'},
+        'require_debug_false': {'()': 'django.utils.log.RequireDebugFalse'},
+    },
+    'handlers': {
+        'console_debug': {'class': 'logging.StreamHandler', 'filters': ['require_debug_true']},
+        'console_warnings': {
+            'class': 'logging.StreamHandler',
+            'level': 'WARNING',
+            'filters': ['require_debug_false'],
+        },
+    },
+    'loggers': {
+        'neo_lms.timing': {
+            'handlers': ['console_debug', 'console_warnings'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
+# Database-backed job queue (jobs app); run workers with `manage.py run_jobs`.
+JOB_WORKER_THREADS = int(os.environ.get("JOB_WORKER_THREADS", "2"))
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", "1"))
+JOB_RETRY_BACKOFF = int(os.environ.get("JOB_RETRY_BACKOFF", "10"))
+# Running jobs refresh their lock every third of this; older locks are stale.
+JOB_LOCK_TIMEOUT = int(os.environ.get("JOB_LOCK_TIMEOUT", "600"))
+JOB_RETENTION_DAYS = int(os.environ.get("JOB_RETENTION_DAYS", "7"))
+
+# Login/refresh activity is buffered and flushed in bulk, at most one row and
+# one last_login write per user per interval. ACTIVITY_BUFFER keeps the buffer
+# in the cache, drained by a periodic job; it needs a cache shared with the
+# workers, so it defaults on only with Redis. Otherwise each process buffers
+# in memory and, in server processes, writes from a background thread.
+ACTIVITY_BUFFER = (
+    os.environ.get("ACTIVITY_BUFFER") or ("True" if os.environ.get("REDIS_URL") else "False")
+) == "True"
+ACTIVITY_FLUSH_INTERVAL = int(os.environ.get("ACTIVITY_FLUSH_INTERVAL", "60"))
+ACTIVITY_RETENTION_DAYS = int(os.environ.get("ACTIVITY_RETENTION_DAYS", "90"))
+
 AUTHENTICATION_BACKENDS = [
     'accounts.backends.EmailOrUsernameModelBackend',
     'django.contrib.auth.backends.ModelBackend',
@@ -14,26 +14,37 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
+from accounts.async_views import AsyncCookieTokenObtainPairView, AsyncUserMeView
 from accounts.views import (
+    ActivityFeedView,
     CookieTokenObtainPairView,
     CookieTokenRefreshView,
     LogoutView,
     UserMeView,
 )
+from neo_lms.db_pool import DatabasePoolStatsView
+
+token_obtain_view = (
+    AsyncCookieTokenObtainPairView if settings.AUTH_ASYNC_VIEWS else CookieTokenObtainPairView
+)
+user_me_view = AsyncUserMeView if settings.API_ASYNC_READS else UserMeView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
     # APIهای احراز هویت (Login & Refresh)
-    path('api/token/', CookieTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/', token_obtain_view.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', CookieTokenRefreshView.as_view(), name='token_refresh'),
     path('api/users/logout/', LogoutView.as_view(), name='logout'),
-    path('api/users/me/', UserMeView.as_view(), name='user_me'),
+    path('api/users/me/', user_me_view.as_view(), name='user_me'),
+    path('api/users/me/activity/', ActivityFeedView.as_view(), name='user_activity'),
 
     # APIهای حساب کاربری (Register)
     path('api/accounts/', include('accounts.urls')),  # <--- این خط اضافه شد
     path('api/courses/', include('courses.urls')),
+    path('api/health/db/', DatabasePoolStatsView.as_view(), name='db_pool_stats'),
 ]
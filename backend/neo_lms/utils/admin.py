@@ -0,0 +1,179 @@
+import json
+
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from neo_lms.db_router import replica_reads
+
+from .jalali import format_jalali, format_jalali_many
+
+
+class JalaliColumnsMixin:
+    """
+    Converts ``jalali_fields`` for the whole changelist page in one batch.
+
+    Display methods read the result through ``jalali_value(obj, field)``.
+    """
+
+    jalali_fields = ()
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        rows = list(changelist.result_list)  # evaluates and caches the page
+        for obj in rows:
+            obj._jalali = {}
+        for field in self.jalali_fields:
+            values = format_jalali_many(getattr(obj, field) for obj in rows)
+            for obj, value in zip(rows, values):
+                obj._jalali[field] = value
+        return changelist
+
+    @staticmethod
+    def jalali_value(obj, field):
+        cached = getattr(obj, '_jalali', {})
+        if field in cached:
+            return cached[field]
+        return format_jalali(getattr(obj, field))
+
+
+def estimate_count(queryset):
+    """
+    Planner row estimate for ``queryset`` on PostgreSQL, ``None`` elsewhere.
+
+    Unfiltered querysets read ``pg_class.reltuples``; filtered ones use the
+    row estimate from ``EXPLAIN``. Neither scans the table.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed/analyzed once.
+            return int(row[0]) if row and row[0] >= 0 else None
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner estimate instead of ``COUNT(*)`` once it passes
+    ``exact_threshold``; small results are still counted exactly.
+    """
+
+    exact_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_threshold:
+            return super().count
+        return estimate
+
+
+class ReplicaChangelistMixin:
+    """
+    Serves changelist GETs from a read replica; actions (POST) stay on the primary.
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        with replica_reads(request.method == 'GET'):
+            return super().changelist_view(request, extra_context)
+
+
+class LargeTableAdminMixin(ReplicaChangelistMixin):
+    """
+    Changelist settings for tables too big to count or join on every page load.
+    """
+
+    paginator = EstimatedCountPaginator
+    # Skips the second, unfiltered COUNT(*) behind "N results (M total)".
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        media = super().media
+        if any(
+            isinstance(f, type) and issubclass(f, AutocompleteFilter) for f in self.list_filter
+        ):
+            # select2 and admin/js/autocomplete.js for the sidebar filters.
+            media += AutocompleteSelect(None, self.admin_site).media
+        return media
+
+
+class AutocompleteFilter(admin.SimpleListFilter):
+    """
+    Sidebar filter on a foreign key rendered as an admin autocomplete box, so
+    the related table is searched on demand instead of listed in full.
+
+    Build one with ``autocomplete_filter('course')``; the related model's
+    admin needs ``search_fields``.
+    """
+
+    template = 'admin/autocomplete_filter.html'
+    field_name = None
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        self.field = model._meta.get_field(self.field_name)
+        # The form field hands the widget a lazy choice iterator; only the
+        # selected row is ever fetched when rendering.
+        self.widget = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(),
+            to_field_name=self.field.remote_field.field_name,
+            required=False,
+            widget=AutocompleteSelect(self.field, model_admin.admin_site),
+        ).widget
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        if not value.isdigit():
+            raise IncorrectLookupParameters(value)
+        return queryset.filter(**{self.field.attname: value})
+
+    def choices(self, changelist):
+        # A single "choice" carrying what the template needs to build the form.
+        yield {
+            'widget': self.widget.render(
+                self.parameter_name, self.value(), attrs={'id': f'filter_{self.parameter_name}'}
+            ),
+            'hidden_params': [
+                (name, value)
+                for name, values in changelist.filter_params.items()
+                if name != self.parameter_name
+                for value in values
+            ],
+        }
+
+
+def autocomplete_filter(field_name, title=None):
+    return type(
+        f'{field_name.title()}AutocompleteFilter',
+        (AutocompleteFilter,),
+        {
+            'field_name': field_name,
+            'parameter_name': f'{field_name}__id__exact',
+            'title': title or field_name.replace('_', ' '),
+        },
+    )
@@ -0,0 +1,86 @@
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return JsonResponse(data, status=status_code, safe=False, json_dumps_params={'ensure_ascii': False})
+
+
+def error_payload(detail):
+    return detail if isinstance(detail, (dict, list)) else {'detail': detail}
+
+
+class AsyncAPIView(View):
+    """
+    Base for plain Django async endpoints that stand in for DRF views.
+
+    Keeps the DRF contract that matters to clients: CSRF exemption, JSON or
+    form bodies and the default throttles.
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def authenticate(self, request):
+        """
+        Return the requesting user (``AnonymousUser`` when no credentials).
+
+        Authenticators exposing ``aauthenticate`` run on the event loop; others
+        are called through ``sync_to_async``. ``AuthenticationFailed`` propagates.
+        """
+        for authentication_class in self.authentication_classes:
+            authenticator = authentication_class()
+            if hasattr(authenticator, 'aauthenticate'):
+                result = await authenticator.aauthenticate(request)
+            else:
+                result = await sync_to_async(authenticator.authenticate)(Request(request))
+            if result is not None:
+                return result[0]
+        return AnonymousUser()
+
+    def parse_body(self, request):
+        if request.content_type == 'application/json':
+            return json.loads(request.body or b'{}')
+        return request.POST.dict()
+
+    def throttle_wait(self, request, user=None):
+        """
+        Return ``None`` when every throttle allows the request, else seconds to wait.
+        """
+        drf_request = Request(request, authenticators=())
+        if user is not None:
+            drf_request.user = user
+        waits = []
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(drf_request, self):
+                waits.append(throttle.wait() or 0)
+        return max(waits) if waits else None
+
+    async def check_throttles(self, request, user=None):
+        """
+        Return a 429 response when throttled, otherwise ``None``.
+        """
+        wait = await sync_to_async(self.throttle_wait)(request, user)
+        if wait is None:
+            return None
+        response = json_response(
+            {'detail': 'تعداد درخواست‌ها بیش از حد مجاز است.'},
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
@@ -0,0 +1,95 @@
+import atexit
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_buffers = []
+_autostart = False
+
+
+class CoalescingBuffer:
+    """
+    Per-process buffer of events coalesced per key with ``merge(previous,
+    value)`` and handed to ``write(pending)`` as a dict.
+
+    Once started, a background thread writes every ``interval`` seconds, or
+    as soon as ``max_size`` keys are pending. Before that nothing is written
+    behind the caller's back; ``flush()`` drains the buffer on demand.
+    """
+
+    def __init__(self, name, write, merge, interval, max_size=None):
+        self.name = name
+        self.write = write
+        self.merge = merge
+        self.interval = interval
+        self.max_size = max_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def add(self, key, value):
+        with self._lock:
+            self._pending[key] = self.merge(self._pending.get(key), value)
+            full = self.max_size is not None and len(self._pending) >= self.max_size
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return self.write(pending)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # The drained events are lost.
+                logger.exception('Could not flush the %s buffer', self.name)
+            finally:
+                close_old_connections()
+
+
+def register(buffer):
+    """
+    Track ``buffer`` so ``start_all`` starts it (immediately if already called).
+    """
+    with _lock:
+        _buffers.append(buffer)
+        start = _autostart
+    if start:
+        buffer.start()
+    return buffer
+
+
+def start_all():
+    """
+    Start the flush threads of this process's buffers, now and as they are
+    created.
+
+    Only the server entry points (neo_lms.wsgi, neo_lms.asgi) call this, so
+    tests and management commands never write from a thread or at exit.
+    Buffers are created on first use, so forking servers start their
+    threads in each worker.
+    """
+    global _autostart
+    with _lock:
+        _autostart = True
+        buffers = list(_buffers)
+    for buffer in buffers:
+        buffer.start()
@@ -1,13 +1,40 @@
+from functools import lru_cache
+
 from django.utils import timezone
 
 try:
-    from jdatetime import datetime as jdatetime
+    from jdatetime import date as jdate
 except ImportError as exc:  # pragma: no cover - import guard
     raise ImportError(
         "jdatetime is required for Persian date formatting in admin. "
         "Add it to your environment to use neo_lms.utils.jalali.",
     ) from exc
 
+# Distinct local calendar days kept converted; a changelist page or API page
+# rarely spans more than a handful.
+DAY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DAY_CACHE_SIZE)
+def jalali_day(day) -> str:
+    """
+    Jalali ``YYYY/MM/DD`` for a Gregorian date, memoized per calendar day.
+    """
+    return jdate.fromgregorian(date=day).strftime("%Y/%m/%d")
+
+
+def _format_local(local_dt, include_time: bool) -> str:
+    day = jalali_day(local_dt.date())
+    if include_time:
+        return f"{day} - {local_dt:%H:%M}"
+    return day
+
+
+def _localize(dt, tz):
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone=timezone.get_default_timezone())
+    return dt.astimezone(tz)
+
 
 def format_jalali(dt, include_time: bool = True) -> str:
     """
@@ -15,13 +42,15 @@ def format_jalali(dt, include_time: bool = True) -> str:
     """
     if not dt:
         return "-"
+    return _format_local(_localize(dt, timezone.get_current_timezone()), include_time)
 
-    if timezone.is_naive(dt):
-        dt = timezone.make_aware(dt, timezone=timezone.get_default_timezone())
 
-    local_dt = timezone.localtime(dt)
-    jdt = jdatetime.fromgregorian(datetime=local_dt)
-    fmt = "%Y/%m/%d"
-    if include_time:
-        fmt = f"{fmt} - %H:%M"
-    return jdt.strftime(fmt)
+def format_jalali_many(values, include_time: bool = True) -> list[str]:
+    """
+    Batch form of ``format_jalali`` for a whole column of datetimes.
+    """
+    tz = timezone.get_current_timezone()
+    return [
+        _format_local(_localize(dt, tz), include_time) if dt else "-"
+        for dt in values
+    ]
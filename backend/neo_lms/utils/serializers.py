@@ -0,0 +1,19 @@
+from .jalali import format_jalali
+
+
+class JalaliFieldsMixin:
+    """
+    Adds ``<field>_jalali`` strings for ``Meta.jalali_fields`` when the request
+    carries ``?jalali=1``; other clients get the unchanged payload.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self._wants_jalali():
+            for field in getattr(self.Meta, 'jalali_fields', ()):
+                data[f'{field}_jalali'] = format_jalali(getattr(instance, field))
+        return data
+
+    def _wants_jalali(self):
+        request = self.context.get('request')
+        return request is not None and request.GET.get('jalali') in ('1', 'true')
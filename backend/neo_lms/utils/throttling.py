@@ -0,0 +1,162 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle, UserRateThrottle
+
+# Sliding-window counter: a request is allowed while
+#   previous_window_count * (1 - elapsed_fraction) + current_window_count < limit
+# Two integers per key, updated atomically in one round trip.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+if previous * (1 - tonumber(ARGV[3])) + current + 1 > limit then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2] * 2)
+return {1, current, previous}
+"""
+
+
+def _window(duration, now):
+    index, offset = divmod(now, duration)
+    return int(index), offset / duration
+
+
+def _wait(limit, duration, fraction, current, previous):
+    """
+    Seconds until the weighted count leaves room for one more request.
+    """
+    if current + 1 > limit:
+        # Not before the next window; there the current count becomes "previous".
+        remaining = duration * (1 - fraction)
+        return remaining + _wait(limit, duration, 0, 0, current)
+    if not previous:
+        return 0
+    needed = 1 - (limit - current - 1) / previous
+    return max(0.0, (needed - fraction) * duration)
+
+
+class RedisWindowStore:
+    """
+    Counters in Redis, shared by every worker process.
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, key, limit, duration, now):
+        index, fraction = _window(duration, now)
+        # Hash tag keeps both windows of a key in one cluster slot.
+        keys = [f'throttle:{{{key}}}:{index}', f'throttle:{{{key}}}:{index - 1}']
+        allowed, current, previous = self.script(keys=keys, args=[limit, duration, fraction])
+        return bool(allowed), int(current), int(previous), fraction
+
+
+class LocalWindowStore:
+    """
+    Same algorithm in process memory: the stand-in for tests and single-process
+    development. Keeps at most ``max_keys`` clients (least recently seen dropped).
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, duration, now):
+        index, fraction = _window(duration, now)
+        with self._lock:
+            window, current, previous = self._counters.pop(key, (index, 0, 0))
+            if window != index:
+                previous = current if window == index - 1 else 0
+                current = 0
+            allowed = previous * (1 - fraction) + current + 1 <= limit
+            if allowed:
+                current += 1
+            self._counters[key] = (index, current, previous)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        return allowed, current, previous, fraction
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                url = settings.THROTTLE_REDIS_URL
+                _store = RedisWindowStore(url) if url else LocalWindowStore()
+    return _store
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces SimpleRateThrottle's timestamp list in the cache with the
+    sliding-window counter of ``get_store()``; rates and keys are unchanged.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, current, previous, fraction = get_store().hit(
+            self.key, self.num_requests, self.duration, time.time()
+        )
+        self._wait = None if allowed else _wait(
+            self.num_requests, self.duration, fraction, current, previous
+        )
+        return allowed
+
+    def wait(self):
+        return None if self._wait is None else max(1, math.ceil(self._wait))
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class ScopedIPThrottle(SlidingWindowThrottleMixin, SimpleRateThrottle):
+    """
+    Per-client-IP limit under its own scope, independent of the anon/user budgets.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginRateThrottle(ScopedIPThrottle):
+    scope = 'login'
+
+
+class RefreshRateThrottle(ScopedIPThrottle):
+    scope = 'refresh'
+
+
+class ProgressRateThrottle(UserSlidingWindowThrottle):
+    """
+    Player heartbeats: a per-user budget of their own, apart from ``user``.
+    """
+
+    scope = 'progress'
@@ -0,0 +1,188 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger('neo_lms.timing')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised instead of logging when API_QUERY_BUDGET_STRICT is on (tests).
+    """
+
+
+@dataclass
+class RequestMetrics:
+    view: str = ''
+    queries: int = 0
+    db: float = 0.0
+    serialize: float = 0.0
+    render: float = 0.0
+    # Nesting depth of serializer.data calls, so inner ones are not double counted.
+    serializer_depth: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def server_timing(self, total):
+        return ', '.join((
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize * 1000:.1f}',
+            f'render;dur={self.render * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ))
+
+
+def _record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db += time.perf_counter() - started
+
+
+def _install_query_recorder(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _timed_data(cls):
+    """
+    ``data`` property for a subclass of ``cls`` that adds its time to the
+    current request's metrics.
+    """
+    parent = cls.data
+
+    def data(self):
+        metrics = _current.get()
+        if metrics is None:
+            return parent.fget(self)
+        metrics.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return parent.fget(self)
+        finally:
+            metrics.serializer_depth -= 1
+            if not metrics.serializer_depth:
+                metrics.serialize += time.perf_counter() - started
+
+    return property(data)
+
+
+_timed_classes = {}
+
+
+def _timed_class(cls):
+    timed = _timed_classes.get(cls)
+    if timed is None:
+        timed = type(cls.__name__, (cls,), {'__module__': cls.__module__, 'data': _timed_data(cls)})
+        _timed_classes[cls] = timed
+    return timed
+
+
+class SerializerTimingMixin:
+    """
+    Generic-view mixin: while ServerTimingMiddleware measures a request, the
+    view's serializers report the time spent in ``serializer.data``.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current.get() is not None and isinstance(serializer, BaseSerializer):
+            serializer.__class__ = _timed_class(type(serializer))
+        return serializer
+
+
+def view_name(view_func, method):
+    """
+    ``CourseViewSet.list``-style key for a resolved view.
+    """
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if cls is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{cls.__name__}.{actions.get(method.lower(), method.lower())}'
+
+
+class ServerTimingMiddleware:
+    """
+    Opt-in (API_TIMING) per-request instrumentation for ``/api/``: query
+    count/time, serializer and render time as a ``Server-Timing`` header and
+    one log line per request, checked against API_QUERY_BUDGETS.
+
+    Serializer time is reported by views using ``SerializerTimingMixin``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.API_TIMING:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        connection_created.connect(_install_query_recorder)
+        for connection in connections.all(initialized_only=True):
+            _install_query_recorder(connection)
+
+    def __call__(self, request):
+        if not request.path.startswith('/api/'):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - metrics.started
+        response['Server-Timing'] = metrics.server_timing(total)
+        self._log(request, response, metrics, total)
+        self._check_budget(metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view = view_name(view_func, request.method)
+
+    def process_template_response(self, request, response):
+        # DRF responses render right after this hook; time it until the callback.
+        metrics = _current.get()
+        if metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                metrics.render += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def _log(self, request, response, metrics, total):
+        fields = {
+            'view': metrics.view or request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 1),
+            'db_queries': metrics.queries,
+            'db_ms': round(metrics.db * 1000, 1),
+            'serialize_ms': round(metrics.serialize * 1000, 1),
+            'render_ms': round(metrics.render * 1000, 1),
+        }
+        logger.info(' '.join(f'{key}={value}' for key, value in fields.items()), extra=fields)
+
+    def _check_budget(self, metrics):
+        budget = settings.API_QUERY_BUDGETS.get(metrics.view, settings.API_QUERY_BUDGET_DEFAULT)
+        if budget is None or metrics.queries <= budget:
+            return
+        message = f'{metrics.view} ran {metrics.queries} queries (budget {budget}).'
+        if settings.API_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
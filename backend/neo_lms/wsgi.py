@@ -11,6 +11,11 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from neo_lms.utils.buffers import start_all
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'neo_lms.settings')
 
 application = get_wsgi_application()
+
+# Background flushes of in-memory event buffers run in server processes only.
+start_all()
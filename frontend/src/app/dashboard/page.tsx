@@ -6,7 +6,7 @@ import { Badge } from "@/components/badge";
 import { Button } from "@/components/button";
 import { EmptyState } from "@/components/empty-state";
 import { Heading } from "@/components/text";
-import { ApiError, apiRequest } from "@/lib/api";
+import { ApiError, apiRequestAllPages } from "@/lib/api";
 import { formatPersianDate } from "@/lib/date";
 
 import { useDashboard } from "./dashboard-context";
@@ -39,7 +39,7 @@ export default function DashboardPage() {
     setLoading(true);
     setError(null);
 
-    apiRequest<Course[]>("/api/courses/")
+    apiRequestAllPages<Course>("/api/courses/")
       .then((data) => {
         if (!active) return;
         setCourses(Array.isArray(data) ? data : []);
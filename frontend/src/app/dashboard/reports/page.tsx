@@ -6,7 +6,7 @@ import { Badge } from "@/components/badge";
 import { Button } from "@/components/button";
 import { EmptyState } from "@/components/empty-state";
 import { Heading } from "@/components/text";
-import { ApiError, apiRequest } from "@/lib/api";
+import { ApiError, apiRequestAllPages } from "@/lib/api";
 import { formatPersianDate } from "@/lib/date";
 
 import { useDashboard } from "../dashboard-context";
@@ -32,7 +32,7 @@ export default function ReportsPage() {
   useEffect(() => {
     let active = true;
     setLoading(true);
-    apiRequest<Course[]>("/api/courses/")
+    apiRequestAllPages<Course>("/api/courses/")
       .then((data) => {
         if (!active) return;
         setCourses(Array.isArray(data) ? data : []);
@@ -69,3 +69,47 @@ function safeJsonParse(value: string) {
     return value;
   }
 }
+
+export type Paginated<T> = {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+};
+
+// Largest page the API serves; the `next` links keep it, so walking a long
+// list costs as few requests (and throttle budget) as possible.
+const MAX_PAGE_SIZE = 100;
+
+export async function apiRequestAllPages<T>(
+  path: string,
+  options: ApiRequestOptions = {},
+): Promise<T[]> {
+  const items: T[] = [];
+  let nextPath: string | null = withPageSize(path, MAX_PAGE_SIZE);
+
+  while (nextPath) {
+    const page: Paginated<T> | T[] = await apiRequest<Paginated<T> | T[]>(
+      nextPath,
+      options,
+    );
+    if (Array.isArray(page)) {
+      return page;
+    }
+    items.push(...(page?.results ?? []));
+    nextPath = page?.next ? toRelativePath(page.next) : null;
+  }
+
+  return items;
+}
+
+function withPageSize(path: string, pageSize: number) {
+  if (/[?&]page_size=/.test(path)) {
+    return path;
+  }
+  return `${path}${path.includes('?') ? '&' : '?'}page_size=${pageSize}`;
+}
+
+function toRelativePath(url: string) {
+  const parsed = new URL(url, API_BASE_URL);
+  return `${parsed.pathname}${parsed.search}`;
+}